@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import datetime
-import json
 import logging
 import re
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from app.services.llm_service import LLMService
+from app.services.llm_service import LLMService, aclose_shared_client
+from app.tools.base import ToolBase
 from app.tools.database_tool import DatabaseAccessTool
 from app.tools.date_tool import DateResolverTool
 from app.tools.generate_image import ImageGeneratorTool
@@ -19,13 +23,191 @@ from app.agents.multilingual_responses import get_multilingual_response_dictiona
 logger = logging.getLogger(__name__)
 
 
+def _in_stock(items: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+    """Return up to ``limit`` listings with stock, stopping the scan once enough are found."""
+    return list(islice((item for item in items if item.get("quantity_available", 0) > 0), limit))
+
+
+@lru_cache(maxsize=512)
+def _format_iso_date(value: str, fmt: str) -> str:
+    """Render an ISO date/datetime string with ``fmt``; listings share few distinct dates."""
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).strftime(fmt)
+
+
+def _positive_price_stats(competitor_prices: List[Dict[str, Any]]) -> Optional[Tuple[float, float, float]]:
+    """Return (average, minimum, maximum) of the positive per-kg prices in one pass, or None."""
+    total = 0.0
+    count = 0
+    min_price = max_price = None
+    for cp in competitor_prices:
+        price = cp.get("price_etb_per_kg", 0)
+        if not price or price <= 0:
+            continue
+        total += price
+        count += 1
+        if min_price is None or price < min_price:
+            min_price = price
+        if max_price is None or price > max_price:
+            max_price = price
+    if not count:
+        return None
+    return total / count, min_price, max_price
+
+
+# Greetings in English, phonetic Amharic and Amharic script.
+_GREETING_PHRASES = (
+    "hello", "hi", "hey", "good morning", "good afternoon", "good evening", "greetings",
+    "selam", "salam", "tenayistilign", "dehna", "dehna hun",
+    "ሰላም", "ጤና ይስጥልኝ", "ደህና",
+)
+_BARE_GREETINGS = frozenset(_GREETING_PHRASES)
+# Substring match of any greeting phrase in a single regex pass.
+_GREETING_RE = re.compile("|".join(map(re.escape, _GREETING_PHRASES)))
+
+# Phrases that mean a supplier is topping up stock they already list.
+_EXISTING_INVENTORY_RE = re.compile(
+    "|".join(map(re.escape, (
+        "existing", "inventory", "add more", "add to my", "more to my", "increase my",
+    )))
+)
+
+# Replies meaning "this product has no expiry date", matched as substrings of the lowered input.
+_NO_EXPIRY_RE = re.compile(
+    "|".join(map(re.escape, ("no", "none", "doesn't", "never", "no expiry")))
+)
+
+# Free-text order slot such as "2 kilo mango": quantity, unit, product name (matched on lowered text).
+_ORDER_TEXT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(kilo|kg|liter|liters?)\s+(.+)')
+# Unit spellings accepted by _ORDER_TEXT_RE -> stored unit.
+_ORDER_UNIT_ALIASES = {"kilo": "kg", "kg": "kg", "liter": "liter", "liters": "liter"}
+
+# Confirmation words (English and phonetic/script Amharic) matched as whole tokens.
+_CONFIRMATION_TOKENS = frozenset({
+    "yes", "yeah", "yep", "ok", "okay", "sure", "confirm",
+    "aw", "awo", "ey", "eshi", "eyu", "አዎ", "እሺ",
+})
+_CONFIRMATION_PHRASES = ("go ahead",)
+_WORD_RE = re.compile(r"[\w']+")
+
+# Unambiguous role answers to the onboarding question, routed without the classifier.
+_ROLE_ANSWERS = {
+    **dict.fromkeys(
+        ("customer", "a customer", "i'm a customer", "i am a customer", "ደንበኛ"),
+        "intent.user.is_customer",
+    ),
+    **dict.fromkeys(
+        ("supplier", "a supplier", "i'm a supplier", "i am a supplier", "አቅራቢ"),
+        "intent.user.is_supplier",
+    ),
+}
+_GREETING_TRIM_CHARS = " \t\r\n!.?,።፣"
+
+# Phonetic (Latin-script) Amharic indicators, compiled once into a single alternation.
+_PHONETIC_AMHARIC_INDICATORS = (
+    # Greetings
+    r'\b(selam|salam|tena|tenayistilign|dehna|dehna hun|selam neger|neger)\b',
+    # Common words
+    r'\b(ine|min|ande|neger|ay|aydelem|meskerem|tikimt|betam|nech|min chu|ey|eyu|konjo|min alebet|min lij|min lijoch)\b',
+    # Question words
+    r'\b(min|ande|yet|lema|ke|kem|kena|ken|kegna|kegne|kegnal|kegnaleh)\b',
+    # Numbers in phonetic
+    r'\b(and|hulet|hulet and|sost|arba|arba and|arba sost|arba arba|ammist|ammist and)\b',
+    # Common phrases
+    r'\b(neger ale|neger lij|neger lijoch|betam neger|betam lij|betam lijoch)\b',
+    # Product related
+    r'\b(tomato|mango|orange|banana|potato|onion|garlic|pepper|carrot|cabbage|lettuce|spinach)\b',
+    # Units
+    r'\b(kilo|kg|liter|liters|quintal|ton)\b',
+)
+_PHONETIC_AMHARIC_RE = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in _PHONETIC_AMHARIC_INDICATORS),
+    re.IGNORECASE,
+)
+
+# Amharic syllables often end with specific patterns
+_AMHARIC_SYLLABLE_RES = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r'\b\w*[aeiou][aeiou]\w*\b',  # Double vowels (common in phonetic Amharic)
+        r'\b\w*esh\w*\b',  # Common ending
+        r'\b\w*och\w*\b',  # Common ending
+        r'\b\w*gn\w*\b',   # Common consonant combination
+        r'\b\w*ch\w*\b',   # Common consonant combination
+        r'\b\w*sh\w*\b',   # Common consonant combination
+    )
+)
+
+# Static instructions for the RAG answers. They are sent as the system message so every
+# request of a kind starts with the same prefix (which the provider can cache), followed by
+# the per-request retrieved context and question in the user message.
+_STORAGE_RAG_PROMPT = (
+    "You are a food storage expert providing objective storage advice. Do not mention ordering, "
+    "marketplace, suppliers, customers, or KCartBot. Focus only on storage recommendations.\n\n"
+    "Base your answer on the storage information provided. Provide clear, concise storage advice that "
+    "incorporates that information. Focus on practical tips that will help preserve freshness and quality."
+)
+_NUTRITION_RAG_PROMPT = (
+    "You are a nutrition expert providing objective nutritional information. Do not mention ordering, "
+    "marketplace, suppliers, customers, or KCartBot. Focus only on the nutritional comparison.\n\n"
+    "Base your answer on the nutritional information provided. Provide a clear, balanced nutritional "
+    "comparison that highlights the key differences and similarities between the two products. Include "
+    "specific nutritional benefits or considerations for each."
+)
+_SEASONAL_RAG_PROMPT = (
+    "You are a seasonal produce expert providing objective information about produce availability. Do not "
+    "mention ordering, marketplace, suppliers, customers, or KCartBot. Focus only on seasonal availability.\n\n"
+    "Based on the seasonal produce information provided, give clear, organized information about seasonal "
+    "produce availability. Include specific fruits and vegetables that are typically available during this "
+    "time, and any relevant tips about quality or selection."
+)
+_IN_SEASON_RAG_PROMPT = (
+    "You are a seasonal produce expert providing objective information about current seasonal produce. Do "
+    "not mention ordering, marketplace, suppliers, customers, or KCartBot. Focus only on what's currently "
+    "in season.\n\n"
+    "Based on the seasonal produce information provided, give clear, organized information about produce "
+    "that is currently in season. Include specific fruits and vegetables, and any relevant tips about "
+    "quality, selection, or availability."
+)
+_ADVISORY_RAG_PROMPT = (
+    "You are a fresh produce expert providing objective advice about fruits and vegetables. Do not mention "
+    "ordering, marketplace, suppliers, customers, or KCartBot. Focus only on the produce-related question.\n\n"
+    "Using the reference information provided, give a clear, helpful and accurate answer to the user's "
+    "question. Focus on practical, actionable advice related to fresh produce."
+)
+
+# Handlers that also take the classifier's missing slots, to prompt for what is still needed.
+_INTENTS_WITH_MISSING_SLOTS = frozenset({
+    "intent.customer.register",
+    "intent.customer.place_order",
+    "intent.supplier.register",
+    "intent.supplier.add_product",
+})
+
+# Read-only stand-in for a missing nested row, so per-row .get() defaults allocate nothing
+_EMPTY_ROW = MappingProxyType({})
+
+# Transaction statuses that still need supplier action (dashboard and delivery checks)
+_OPEN_ORDER_STATUSES = frozenset({"Pending", "Confirmed"})
+
+# Listing status -> marker shown in the supplier stock view; anything else is "❌"
+_STOCK_STATUS_EMOJI = {"active": "✅", "on_sale": "⏸️"}
+
+# Fixed lead-in for the flash sale block of the supplier dashboard
+_FLASH_SALE_INTRO = (
+    "💡 **Flash Sale Suggestions:**",
+    "I've created flash sale proposals for your expiring products with 25% discount.",
+    "You can accept these to attract customers and reduce waste.",
+)
+
+
 class Agent:
     """Main agent that orchestrates LLM and tools for KCartBot conversations."""
 
     def __init__(self) -> None:
         """Initialize the agent with all required tools and services."""
         self.llm_service = LLMService()
-        self.intent_classifier = IntentClassifierTool()  # Create its own LLM service instance
+        # The classifier sends its own system prompt per call, so it can share the agent's service
+        self.intent_classifier = IntentClassifierTool(llm_service=self.llm_service)
         self.database_tool = DatabaseAccessTool()
         self.vector_search = VectorSearchTool()
         self.date_resolver = DateResolverTool(llm_service=self.llm_service)
@@ -40,6 +222,65 @@ class Agent:
             "image_generator": self.image_generator,
         }
 
+        # Intent -> bound handler(filled_slots, session_context), built once per agent so each
+        # turn dispatches with one dict lookup instead of walking an elif chain; intents in
+        # _INTENTS_WITH_MISSING_SLOTS also get missing_slots before the session context
+        self._customer_handlers: Dict[str, Callable[..., Awaitable[str]]] = {
+            "intent.customer.register": self._handle_customer_registration,
+            "intent.customer.check_availability": self._handle_product_availability,
+            "intent.customer.storage_advice": self._handle_storage_advice,
+            "intent.customer.nutrition_query": self._handle_nutrition_query,
+            "intent.customer.seasonal_query": self._handle_seasonal_query,
+            "intent.customer.what_is_in_season": self._handle_in_season_query,
+            "intent.customer.general_advisory": self._handle_general_advisory,
+            "intent.customer.place_order": self._handle_place_order,
+            "intent.customer.set_delivery_date": self._handle_set_delivery_date,
+            "intent.customer.set_delivery_location": self._handle_set_delivery_location,
+            "intent.customer.confirm_payment": self._handle_confirm_payment,
+            "intent.customer.check_deliveries": self._handle_customer_check_deliveries,
+        }
+        self._supplier_handlers: Dict[str, Callable[..., Awaitable[str]]] = {
+            "intent.supplier.register": self._handle_supplier_registration,
+            "intent.supplier.add_product": self._handle_add_product,
+            "intent.supplier.set_quantity": self._handle_set_quantity,
+            "intent.supplier.update_inventory": self._handle_update_inventory,
+            "intent.supplier.set_delivery_dates": self._handle_set_delivery_dates,
+            "intent.supplier.set_expiry_date": self._handle_set_expiry_date,
+            "intent.supplier.set_price": self._handle_set_price,
+            "intent.supplier.request_pricing_insight": self._handle_pricing_insight,
+            "intent.supplier.generate_product_image": self._handle_generate_image,
+            "intent.supplier.check_deliveries": self._handle_supplier_check_deliveries,
+            "intent.supplier.check_stock": lambda slots, ctx: self._handle_check_stock(ctx),
+            "intent.supplier.view_expiring_products": self._handle_view_expiring_products,
+            "intent.supplier.accept_flash_sale": self._handle_accept_flash_sale,
+            "intent.supplier.decline_flash_sale": self._handle_decline_flash_sale,
+            "intent.supplier.view_delivery_schedule": self._handle_view_delivery_schedule,
+            "intent.supplier.check_deliveries_by_date": self._handle_check_deliveries_by_date,
+            # No handler exists for these yet; resolving on call keeps them failing into
+            # the generic error reply instead of breaking agent construction
+            "intent.supplier.add_to_existing": lambda slots, ctx: self._handle_add_to_existing(ctx),
+            "intent.supplier.create_new_listing": lambda slots, ctx: self._handle_create_new_listing(ctx),
+            "intent.customer.nutrition_query": self._handle_nutrition_query,
+        }
+
+    async def aclose(self) -> None:
+        """Close every tool that holds external resources and the pooled LLM client concurrently."""
+        names: List[str] = []
+        closers = []
+        for name, tool in self.tools.items():
+            closer = getattr(tool, "aclose", None)
+            if callable(closer):
+                names.append(name)
+                closers.append(closer())
+
+        names.append("llm_client")
+        closers.append(aclose_shared_client())
+
+        results = await asyncio.gather(*closers, return_exceptions=True)
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.warning("Failed to close %s: %s", name, result)
+
     def _detect_language(self, text: str) -> str:
         """
         Detect the language of the input text.
@@ -49,62 +290,34 @@ class Agent:
             'phonetic_amharic' for phonetic/latinized Amharic (e.g., "selam", "neger")
             'english' for English
         """
-        if not text or not text.strip():
+        # Strip once and test the result, rather than stripping again after the emptiness check
+        text = text.strip() if text else ""
+        if not text:
             return "english"  # Default fallback
         
-        text = text.strip()
-        
         # Check for Amharic script characters (Ethiopic script)
-        # Amharic uses characters in the range U+1200 to U+137F
-        amharic_chars = sum(1 for char in text if '\u1200' <= char <= '\u137f')
-        total_chars = len(text.replace(' ', ''))
+        # Amharic uses characters in the range U+1200 to U+137F; ASCII-only text has none
+        amharic_chars = 0 if text.isascii() else sum(1 for char in text if '\u1200' <= char <= '\u137f')
+        total_chars = len(text) - text.count(' ')  # non-space characters, without building a copy
         
         if amharic_chars > total_chars * 0.3:  # More than 30% Amharic characters
             return "amharic"
         
-        # Check for phonetic Amharic patterns
-        # Common phonetic Amharic words and patterns
-        phonetic_amharic_indicators = [
-            # Greetings
-            r'\b(selam|salam|tena|tenayistilign|dehna|dehna hun|selam neger|neger)\b',
-            # Common words
-            r'\b(ine|min|ande|neger|ay|aydelem|meskerem|tikimt|betam|nech|min chu|ey|eyu|konjo|min alebet|min lij|min lijoch)\b',
-            # Question words
-            r'\b(min|ande|yet|lema|ke|kem|kena|ken|kegna|kegne|kegnal|kegnaleh)\b',
-            # Numbers in phonetic
-            r'\b(and|hulet|hulet and|sost|arba|arba and|arba sost|arba arba|ammist|ammist and)\b',
-            # Common phrases
-            r'\b(neger ale|neger lij|neger lijoch|betam neger|betam lij|betam lijoch)\b',
-            # Product related
-            r'\b(tomato|mango|orange|banana|potato|onion|garlic|pepper|carrot|cabbage|lettuce|spinach)\b',
-            # Units
-            r'\b(kilo|kg|liter|liters|quintal|ton)\b'
-        ]
-        
-        # Check if text matches phonetic patterns
-        combined_pattern = '|'.join(f'(?:{pattern})' for pattern in phonetic_amharic_indicators)
-        if re.search(combined_pattern, text.lower(), re.IGNORECASE):
+        # Lower once; every pattern below matches against the same lowered text
+        lowered = text.lower()
+
+        # Check if text matches phonetic Amharic patterns
+        if _PHONETIC_AMHARIC_RE.search(lowered):
             return "phonetic_amharic"
         
-        # Additional check: if text contains many common Amharic syllable patterns
-        # Amharic syllables often end with specific patterns
-        amharic_syllable_patterns = [
-            r'\b\w*[aeiou][aeiou]\w*\b',  # Double vowels (common in phonetic Amharic)
-            r'\b\w*esh\w*\b',  # Common ending
-            r'\b\w*och\w*\b',  # Common ending
-            r'\b\w*gn\w*\b',   # Common consonant combination
-            r'\b\w*ch\w*\b',   # Common consonant combination
-            r'\b\w*sh\w*\b',   # Common consonant combination
-        ]
-        
+        # Additional check: if text contains many common Amharic syllable patterns.
+        # Multiple matches mean likely phonetic Amharic, so stop scanning at the second one
         phonetic_matches = 0
-        for pattern in amharic_syllable_patterns:
-            if re.search(pattern, text.lower()):
+        for pattern in _AMHARIC_SYLLABLE_RES:
+            if pattern.search(lowered):
                 phonetic_matches += 1
-        
-        # If multiple phonetic patterns match, likely phonetic Amharic
-        if phonetic_matches >= 2:
-            return "phonetic_amharic"
+                if phonetic_matches >= 2:
+                    return "phonetic_amharic"
         
         # Default to English
         return "english"
@@ -182,21 +395,25 @@ class Agent:
             # Detect language from user message
             detected_language = self._detect_language(user_message)
             session_context["detected_language"] = detected_language
-            logger.info(f"Detected language: {detected_language}")
-
-            # Step 1: Classify intent
-            intent_result = await self.intent_classifier.run(
-                {"text": user_message},
-                context={"chat_history": chat_history}
-            )
+            logger.info("Detected language: %s", detected_language)
+
+            # Step 1: Classify intent (greetings, role answers and context-free confirmations
+            # need no classifier round-trip)
+            intent_result = self._fastpath_intent(user_message, chat_history)
+            if intent_result is None:
+                intent_result = await self.intent_classifier.run(
+                    {"text": user_message},
+                    context={"chat_history": chat_history}
+                )
 
             intent = intent_result.get("intent", "intent.unknown")
             flow = intent_result.get("flow", "unknown")
-            filled_slots = intent_result.get("filled_slots", {})
-            missing_slots = intent_result.get("missing_slots", [])
-            suggested_tools = intent_result.get("suggested_tools", [])
+            # The classifier always fills these; only build empty defaults when one is absent
+            filled_slots = intent_result.get("filled_slots") or {}
+            missing_slots = intent_result.get("missing_slots") or []
+            suggested_tools = intent_result.get("suggested_tools") or []
 
-            logger.info(f"Classified intent: {intent}, flow: {flow}, missing_slots: {missing_slots}")
+            logger.info("Classified intent: %s, flow: %s, missing_slots: %s", intent, flow, missing_slots)
 
             # Update session context with current intent and flow
             session_context.update({
@@ -226,12 +443,14 @@ class Agent:
                 response = self._get_multilingual_response("error_unknown", detected_language)
 
             # Step 3: Update chat history
-            chat_history.append({"role": "user", "content": user_message})
-            chat_history.append({"role": "assistant", "content": response})
+            chat_history.extend((
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": response},
+            ))
 
-            # Keep only last 10 exchanges to avoid token overflow
+            # Keep only last 10 exchanges to avoid token overflow; trim in place rather than copying the tail
             if len(chat_history) > 20:
-                chat_history = chat_history[-20:]
+                del chat_history[:-20]
 
             session_context["chat_history"] = chat_history
 
@@ -255,30 +474,94 @@ class Agent:
                 "error": str(exc)
             }
 
+    @staticmethod
+    def _is_confirmation(lowered_message: str) -> bool:
+        """Return True when a lower-cased message contains a confirmation word or phrase."""
+        if any(phrase in lowered_message for phrase in _CONFIRMATION_PHRASES):
+            return True
+        return not _CONFIRMATION_TOKENS.isdisjoint(_WORD_RE.findall(lowered_message))
+
+    @staticmethod
+    def _fastpath_intent(
+        user_message: str, chat_history: Optional[List[Dict[str, str]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return a ready classification for messages that need no LLM to route.
+
+        Covers bare greetings, one-word role answers, and confirmations sent before
+        there is any conversation for them to confirm.
+        """
+        normalised = user_message.strip(_GREETING_TRIM_CHARS).lower()
+        if normalised in _BARE_GREETINGS:
+            return {
+                "intent": "intent.unknown",
+                "flow": "unknown",
+                "confidence": 1.0,
+                "filled_slots": {},
+                "missing_slots": [],
+                "suggested_tools": [],
+                "rationale": "Bare greeting answered without classification.",
+            }
+        if not chat_history and normalised in _CONFIRMATION_TOKENS:
+            return {
+                "intent": "intent.unknown",
+                "flow": "unknown",
+                "confidence": 1.0,
+                "filled_slots": {},
+                "missing_slots": [],
+                "suggested_tools": [],
+                "rationale": "Confirmation without prior context.",
+            }
+        role_intent = _ROLE_ANSWERS.get(normalised)
+        if role_intent is not None:
+            return {
+                "intent": role_intent,
+                "flow": "onboarding",
+                "confidence": 1.0,
+                "filled_slots": {},
+                "missing_slots": [],
+                "suggested_tools": [],
+                "rationale": "Role answer matched without classification.",
+            }
+        return None
+
+    async def process_messages(
+        self,
+        items: List[Tuple[str, Optional[Dict[str, Any]]]],
+        *,
+        max_concurrency: int = 8,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several independent messages concurrently.
+
+        Args:
+            items: ``(user_message, session_context)`` pairs. Each pair must carry its
+                own session context; contexts are updated in place as in ``process_message``.
+            max_concurrency: Maximum number of messages processed at the same time.
+
+        Returns:
+            One result per item, in the same order as ``items``.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _process(user_message: str, session_context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_message(user_message, session_context)
+
+        return list(await asyncio.gather(*(_process(message, context) for message, context in items)))
+
     async def _handle_unknown_intent(
         self, user_message: str, chat_history: List[Dict[str, str]], language: str = "english"
     ) -> str:
         """Handle unknown intents by asking for clarification."""
+        lowered = user_message.lower()
+
         # Check for simple greetings
-        greeting_words = ["hello", "hi", "hey", "good morning", "good afternoon", "good evening", "greetings"]
-        phonetic_greetings = ["selam", "salam", "tenayistilign", "dehna", "dehna hun"]
-        amharic_greetings = ["ሰላም", "ጤና ይስጥልኝ", "ደህና"]
-        
-        all_greetings = greeting_words + phonetic_greetings + amharic_greetings
-        
-        if any(word in user_message.lower() for word in all_greetings):
+        if _GREETING_RE.search(lowered):
             return self._get_multilingual_response("greeting", language)
 
         # Check if this might be a confirmation of previous context
-        if chat_history:
-            last_assistant_msg = None
-            for msg in reversed(chat_history):
-                if msg.get("role") == "assistant":
-                    last_assistant_msg = msg.get("content", "")
-                    break
-
-            if any(word in user_message.lower() for word in ["yes", "okay", "sure", "go ahead", "confirm", "aw", "ey", "eyu"]):
-                return self._get_multilingual_response("confirmation_response", language)
+        if chat_history and self._is_confirmation(lowered):
+            return self._get_multilingual_response("confirmation_response", language)
 
         return self._get_multilingual_response("unknown_intent", language)
 
@@ -294,44 +577,12 @@ class Agent:
         language = session_context.get("detected_language", "english")
         
         try:
-            if intent == "intent.customer.register":
-                return await self._handle_customer_registration(filled_slots, missing_slots, session_context)
-
-            elif intent == "intent.customer.check_availability":
-                return await self._handle_product_availability(filled_slots, session_context)
-
-            elif intent == "intent.customer.storage_advice":
-                return await self._handle_storage_advice(filled_slots, session_context)
-
-            elif intent == "intent.customer.nutrition_query":
-                return await self._handle_nutrition_query(filled_slots, session_context)
-
-            elif intent == "intent.customer.seasonal_query":
-                return await self._handle_seasonal_query(filled_slots, session_context)
-
-            elif intent == "intent.customer.what_is_in_season":
-                return await self._handle_in_season_query(filled_slots, session_context)
-
-            elif intent == "intent.customer.general_advisory":
-                return await self._handle_general_advisory(filled_slots, session_context)
-
-            elif intent == "intent.customer.place_order":
-                return await self._handle_place_order(filled_slots, missing_slots, session_context)
-
-            elif intent == "intent.customer.set_delivery_date":
-                return await self._handle_set_delivery_date(filled_slots, session_context)
-
-            elif intent == "intent.customer.set_delivery_location":
-                return await self._handle_set_delivery_location(filled_slots, session_context)
-
-            elif intent == "intent.customer.confirm_payment":
-                return await self._handle_confirm_payment(filled_slots, session_context)
-
-            elif intent == "intent.customer.check_deliveries":
-                return await self._handle_customer_check_deliveries(filled_slots, session_context)
-
-            else:
+            handler = self._customer_handlers.get(intent)
+            if handler is None:
                 return self._get_multilingual_response("error_unknown", language)
+            if intent in _INTENTS_WITH_MISSING_SLOTS:
+                return await handler(filled_slots, missing_slots, session_context)
+            return await handler(filled_slots, session_context)
 
         except Exception as exc:
             logger.error(f"Error in customer flow: {exc}")
@@ -348,65 +599,12 @@ class Agent:
         language = session_context.get("detected_language", "english")
         """Handle supplier flow intents."""
         try:
-            if intent == "intent.supplier.register":
-                return await self._handle_supplier_registration(filled_slots, missing_slots, session_context)
-
-            elif intent == "intent.supplier.add_product":
-                return await self._handle_add_product(filled_slots, missing_slots, session_context)
-
-            elif intent == "intent.supplier.set_quantity":
-                return await self._handle_set_quantity(filled_slots, session_context)
-
-            elif intent == "intent.supplier.update_inventory":
-                return await self._handle_update_inventory(filled_slots, session_context)
-
-            elif intent == "intent.supplier.set_delivery_dates":
-                return await self._handle_set_delivery_dates(filled_slots, session_context)
-
-            elif intent == "intent.supplier.set_expiry_date":
-                return await self._handle_set_expiry_date(filled_slots, session_context)
-
-            elif intent == "intent.supplier.set_price":
-                return await self._handle_set_price(filled_slots, session_context)
-
-            elif intent == "intent.supplier.request_pricing_insight":
-                return await self._handle_pricing_insight(filled_slots, session_context)
-
-            elif intent == "intent.supplier.generate_product_image":
-                return await self._handle_generate_image(filled_slots, session_context)
-
-            elif intent == "intent.supplier.check_deliveries":
-                return await self._handle_supplier_check_deliveries(filled_slots, session_context)
-
-            elif intent == "intent.supplier.check_stock":
-                return await self._handle_check_stock(session_context)
-
-            elif intent == "intent.supplier.view_expiring_products":
-                return await self._handle_view_expiring_products(filled_slots, session_context)
-
-            elif intent == "intent.supplier.accept_flash_sale":
-                return await self._handle_accept_flash_sale(filled_slots, session_context)
-
-            elif intent == "intent.supplier.decline_flash_sale":
-                return await self._handle_decline_flash_sale(filled_slots, session_context)
-
-            elif intent == "intent.supplier.view_delivery_schedule":
-                return await self._handle_view_delivery_schedule(filled_slots, session_context)
-
-            elif intent == "intent.supplier.check_deliveries_by_date":
-                return await self._handle_check_deliveries_by_date(filled_slots, session_context)
-
-            elif intent == "intent.supplier.add_to_existing":
-                return await self._handle_add_to_existing(session_context)
-
-            elif intent == "intent.supplier.create_new_listing":
-                return await self._handle_create_new_listing(session_context)
-
-            elif intent == "intent.customer.nutrition_query":
-                return await self._handle_nutrition_query(filled_slots, session_context)
-
-            else:                
+            handler = self._supplier_handlers.get(intent)
+            if handler is None:
                 return self._get_multilingual_response("error_supplier", language)
+            if intent in _INTENTS_WITH_MISSING_SLOTS:
+                return await handler(filled_slots, missing_slots, session_context)
+            return await handler(filled_slots, session_context)
 
         except Exception as exc:
             logger.error(f"Error in supplier flow: {exc}")
@@ -496,17 +694,12 @@ class Agent:
     async def _get_supplier_dashboard_info(self, supplier_id: int) -> str:
         """Get dashboard information for supplier login."""
         try:
-            dashboard_parts = []
-
-            # Get pending orders
-            pending_orders = await self._get_supplier_pending_orders(supplier_id)
-            if pending_orders:
-                dashboard_parts.append(pending_orders)
-
-            # Get expiring products and flash sale suggestions
-            expiring_info = await self._get_supplier_expiring_products_and_suggestions(supplier_id)
-            if expiring_info:
-                dashboard_parts.append(expiring_info)
+            # Pending orders and expiring products are independent; load them together
+            pending_orders, expiring_info = await asyncio.gather(
+                self._get_supplier_pending_orders(supplier_id),
+                self._get_supplier_expiring_products_and_suggestions(supplier_id),
+            )
+            dashboard_parts = [part for part in (pending_orders, expiring_info) if part]
 
             if not dashboard_parts:
                 return "You have no pending orders or expiring products at this time."
@@ -517,6 +710,36 @@ class Agent:
             logger.error(f"Failed to get supplier dashboard info: {exc}")
             return "I couldn't load your dashboard information right now."
 
+    async def _run_tool_batch(self, invocations: List[Tuple[ToolBase, Any]]) -> List[Any]:
+        """Run independent tool invocations concurrently.
+
+        Results come back in invocation order; a failing call yields its exception
+        in place instead of cancelling the rest of the batch.
+        """
+        return list(await asyncio.gather(
+            *(tool.run(payload) for tool, payload in invocations),
+            return_exceptions=True,
+        ))
+
+    async def _fetch_order_transactions(
+        self, order_items: List[Dict[str, Any]]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch every distinct transaction referenced by ``order_items`` exactly once."""
+        order_ids = list(dict.fromkeys(item["order"]["order_id"] for item in order_items))
+        results = await self._run_tool_batch([
+            (self.database_tool, {
+                "table": "transactions",
+                "method": "get_transaction_by_id",
+                "args": [order_id],
+                "kwargs": {}
+            })
+            for order_id in order_ids
+        ])
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return dict(zip(order_ids, results))
+
     async def _get_supplier_pending_orders(self, supplier_id: int) -> str:
         """Get pending orders for a supplier."""
         try:
@@ -531,34 +754,31 @@ class Agent:
             if not order_items:
                 return ""
 
-            # Filter for pending/confirmed orders
-            pending_orders = []
-            for item in order_items:
-                # Get the transaction for this order item
-                transaction = await self.database_tool.run({
-                    "table": "transactions",
-                    "method": "get_transaction_by_id",
-                    "args": [item["order"]["order_id"]],
-                    "kwargs": {}
-                })
-
-                if transaction and transaction.get("status") in ["Pending", "Confirmed"]:
-                    pending_orders.append({
-                        "order_id": transaction["order_id"],
-                        "customer": transaction.get("user", "Unknown customer"),
-                        "product": item.get("product", "Unknown product"),
-                        "quantity": item.get("quantity", 0),
-                        "unit": item.get("unit", "kg"),
-                        "delivery_date": transaction.get("delivery_date"),
-                        "status": transaction.get("status", "Unknown")
-                    })
-
-            if not pending_orders:
-                return ""
+            # Items of the same order share one transaction; look each up once
+            transactions = await self._fetch_order_transactions(order_items)
 
-            # Format the response as a single line paragraph
+            # Filter for pending/confirmed orders, formatting only the first 5 and counting the rest
             order_descriptions = []
-            for order in pending_orders[:5]:  # Show up to 5 orders
+            pending_count = 0
+            for item in order_items:
+                transaction = transactions.get(item["order"]["order_id"])
+
+                if not transaction or transaction.get("status") not in _OPEN_ORDER_STATUSES:
+                    continue
+                pending_count += 1
+                if pending_count > 5:  # Show up to 5 orders
+                    continue
+
+                order = {
+                    "order_id": transaction["order_id"],
+                    "customer": transaction.get("user", "Unknown customer"),
+                    "product": item.get("product", "Unknown product"),
+                    "quantity": item.get("quantity", 0),
+                    "unit": item.get("unit", "kg"),
+                    "delivery_date": transaction.get("delivery_date"),
+                    "status": transaction.get("status", "Unknown")
+                }
+
                 product_name = "Unknown product"
                 if isinstance(order["product"], dict):
                     product_name = order["product"].get("product_name_en", "Unknown product")
@@ -574,14 +794,12 @@ class Agent:
                 delivery_info = ""
                 if order["delivery_date"]:
                     try:
-                        from datetime import datetime
                         if isinstance(order["delivery_date"], str):
                             if 'T' in order["delivery_date"]:
                                 delivery_date = order["delivery_date"].split('T')[0]
                             else:
                                 delivery_date = order["delivery_date"]
-                            date_obj = datetime.fromisoformat(delivery_date.replace('Z', '+00:00'))
-                            delivery_info = f" - Delivery: {date_obj.strftime('%b %d')}"
+                            delivery_info = f" - Delivery: {_format_iso_date(delivery_date, '%b %d')}"
                     except:
                         delivery_info = f" - Delivery: {order['delivery_date']}"
 
@@ -590,8 +808,11 @@ class Agent:
                     f"({order['quantity']} {order['unit']}) for {customer_name} in {customer_location}{delivery_info} - {order['status']}"
                 )
 
-            if len(pending_orders) > 5:
-                order_descriptions.append(f"and {len(pending_orders) - 5} more pending orders")
+            if not pending_count:
+                return ""
+
+            if pending_count > 5:
+                order_descriptions.append(f"and {pending_count - 5} more pending orders")
 
             return "📦 **Pending Orders:** " + ", ".join(order_descriptions) + "."
 
@@ -641,10 +862,8 @@ class Agent:
                 expiry_info = "Unknown expiry"
                 if expiry_date:
                     try:
-                        from datetime import datetime
                         if isinstance(expiry_date, str):
-                            date_obj = datetime.fromisoformat(expiry_date.replace('Z', '+00:00'))
-                            expiry_info = date_obj.strftime('%b %d')
+                            expiry_info = _format_iso_date(expiry_date, '%b %d')
                         else:
                             expiry_info = str(expiry_date)
                     except:
@@ -662,9 +881,7 @@ class Agent:
 
             # Add flash sale suggestions
             if proposed_sales:
-                response_parts.append("💡 **Flash Sale Suggestions:**")
-                response_parts.append("I've created flash sale proposals for your expiring products with 25% discount.")
-                response_parts.append("You can accept these to attract customers and reduce waste.")
+                response_parts.extend(_FLASH_SALE_INTRO)
 
                 for sale in proposed_sales[:3]:  # Show up to 3 suggestions
                     product_name = "Unknown product"
@@ -820,18 +1037,15 @@ class Agent:
                     "kwargs": {"filters": {"product": product["product_id"]}}
                 })
 
-                available_products = []
-                for item in result:
-                    if item.get("quantity_available", 0) > 0:
-                        available_products.append(item)
+                available_products = _in_stock(result, 3)
 
                 if not available_products:
                     return self._get_multilingual_response("product_not_available", language, product_name=product_name)
 
                 # Show available options
                 response_parts = [self._get_multilingual_response("product_available", language, product_name=product_name)]
-                for item in available_products[:3]:  # Show up to 3 options
-                    supplier_name = item.get("supplier", {}).get("name", "Unknown supplier")
+                for item in available_products:  # Show up to 3 options
+                    supplier_name = item.get("supplier", _EMPTY_ROW).get("name", "Unknown supplier")
                     price = item.get("unit_price_etb", 0)
                     unit = item.get("unit", "kg")
                     quantity = item.get("quantity_available", 0)
@@ -856,10 +1070,7 @@ class Agent:
                     "kwargs": {"filters": {"supplier": supplier["user_id"]}}
                 })
 
-                available_products = []
-                for item in result:
-                    if item.get("quantity_available", 0) > 0:
-                        available_products.append(item)
+                available_products = _in_stock(result, 5)
 
                 if not available_products:
                     return self._get_multilingual_response("supplier_no_products", language, supplier_name=product_name)
@@ -869,8 +1080,8 @@ class Agent:
 
                 # Show products from this supplier
                 response_parts = [self._get_multilingual_response("supplier_products", language, supplier_name=product_name)]
-                for item in available_products[:5]:  # Show up to 5 products
-                    product_name_display = item.get("product", {}).get("product_name_en", "Unknown product")
+                for item in available_products:  # Show up to 5 products
+                    product_name_display = item.get("product", _EMPTY_ROW).get("product_name_en", "Unknown product")
                     price = item.get("unit_price_etb", 0)
                     unit = item.get("unit", "kg")
                     quantity = item.get("quantity_available", 0)
@@ -937,22 +1148,15 @@ class Agent:
             user_question = f"How should I store {product_name}?"
 
             # Create RAG prompt
-            rag_prompt = f"""
-You are a food storage expert providing objective storage advice. Do not mention ordering, marketplace, suppliers, customers, or KCartBot. Focus only on storage recommendations.
-
-Based on the following storage information, provide helpful and practical advice for storing {product_name}. 
+            rag_prompt = f"""Provide helpful and practical advice for storing {product_name}.
 
 Storage Information:
 {context_combined}
 
-User Question: {user_question}
-
-Please provide clear, concise storage advice that incorporates the relevant information above. Focus on practical tips that will help preserve freshness and quality.
-"""
+User Question: {user_question}"""
 
             # Use LLM to generate response
-            llm = self.llm_service.clone(system_prompt="")
-            llm_response = await llm.acomplete(rag_prompt)
+            llm_response = await self.llm_service.acomplete(rag_prompt, system_prompt=_STORAGE_RAG_PROMPT)
 
             if llm_response and llm_response.strip():
                 return llm_response.strip()
@@ -976,15 +1180,21 @@ Please provide clear, concise storage advice that incorporates the relevant info
             return self._get_multilingual_response("nutrition_query_missing_products", language)
 
         try:
-            # Get English names for both products
-            english_names = []
-            for product_name in [product_a, product_b]:
-                product = await self.database_tool.run({
+            # Get English names for both products in one concurrent batch
+            products = await self._run_tool_batch([
+                (self.database_tool, {
                     "table": "products",
                     "method": "find_product_by_any_name",
                     "args": [product_name],
                     "kwargs": {}
                 })
+                for product_name in (product_a, product_b)
+            ])
+            english_names = []
+            for product_name, product in zip((product_a, product_b), products):
+                if isinstance(product, Exception):
+                    logger.warning("Product lookup failed for %s: %s", product_name, product)
+                    product = None
                 if product and product.get("product_name_en") and product["product_name_en"] != "Unknown":
                     english_names.append(product["product_name_en"])
                 else:
@@ -1014,22 +1224,15 @@ Please provide clear, concise storage advice that incorporates the relevant info
             user_question = f"How do {product_a} and {product_b} compare nutritionally?"
 
             # Create RAG prompt
-            rag_prompt = f"""
-You are a nutrition expert providing objective nutritional information. Do not mention ordering, marketplace, suppliers, customers, or KCartBot. Focus only on the nutritional comparison.
-
-Based on the following nutritional information, provide a helpful comparison between {product_a} and {product_b}.
+            rag_prompt = f"""Provide a helpful comparison between {product_a} and {product_b}.
 
 Nutritional Information:
 {context_combined}
 
-User Question: {user_question}
-
-Please provide a clear, balanced nutritional comparison that highlights the key differences and similarities between these two products. Include specific nutritional benefits or considerations for each.
-"""
+User Question: {user_question}"""
 
             # Use LLM to generate response
-            llm = self.llm_service.clone(system_prompt="")
-            llm_response = await llm.acomplete(rag_prompt)
+            llm_response = await self.llm_service.acomplete(rag_prompt, system_prompt=_NUTRITION_RAG_PROMPT)
 
             if llm_response and llm_response.strip():
                 return llm_response.strip()
@@ -1049,13 +1252,12 @@ Please provide a clear, balanced nutritional comparison that highlights the key
         season = filled_slots.get("season")
         location = filled_slots.get("location")
 
-        query = "seasonal produce availability"
-        if season:
-            query += f" in {season}"
-        if location:
-            query += f" in {location}"
+        # Format the location clause once; the search query and the question both use it
+        location_clause = f" in {location}" if location else ""
+        season_clause = f" in {season}" if season else ""
+        query = f"seasonal produce availability{season_clause}{location_clause}"
 
-        user_question = f"What produce is available in {season or 'different seasons'}{' in ' + location if location else ''}?"
+        user_question = f"What produce is available in {season or 'different seasons'}{location_clause}?"
 
         try:
             # Retrieve relevant context
@@ -1081,22 +1283,13 @@ Please provide a clear, balanced nutritional comparison that highlights the key
             context_combined = "\n".join(context_texts)
 
             # Create RAG prompt
-            rag_prompt = f"""
-You are a seasonal produce expert providing objective information about produce availability. Do not mention ordering, marketplace, suppliers, customers, or KCartBot. Focus only on seasonal availability.
-
-Based on the following seasonal produce information, provide helpful advice about produce availability.
-
-Seasonal Information:
+            rag_prompt = f"""Seasonal Information:
 {context_combined}
 
-User Question: {user_question}
-
-Please provide clear, organized information about seasonal produce availability. Include specific fruits and vegetables that are typically available during this time, and any relevant tips about quality or selection.
-"""
+User Question: {user_question}"""
 
             # Use LLM to generate response
-            llm = self.llm_service.clone(system_prompt="")
-            llm_response = await llm.acomplete(rag_prompt)
+            llm_response = await self.llm_service.acomplete(rag_prompt, system_prompt=_SEASONAL_RAG_PROMPT)
 
             if llm_response and llm_response.strip():
                 return llm_response.strip()
@@ -1114,11 +1307,10 @@ Please provide clear, organized information about seasonal produce availability.
         """Handle 'what's in season' queries using RAG."""
         language = session_context.get("detected_language", "english")
         location = filled_slots.get("location")
-        query = "what produce is currently in season"
-        if location:
-            query += f" in {location}"
+        location_clause = f" in {location}" if location else ""
+        query = f"what produce is currently in season{location_clause}"
 
-        user_question = f"What produce is currently in season{' in ' + location if location else ''}?"
+        user_question = f"What produce is currently in season{location_clause}?"
 
         try:
             # Retrieve relevant context
@@ -1144,22 +1336,13 @@ Please provide clear, organized information about seasonal produce availability.
             context_combined = "\n".join(context_texts)
 
             # Create RAG prompt
-            rag_prompt = f"""
-You are a seasonal produce expert providing objective information about current seasonal produce. Do not mention ordering, marketplace, suppliers, customers, or KCartBot. Focus only on what's currently in season.
-
-Based on the following information about seasonal produce, provide helpful information about what's currently in season.
-
-Seasonal Information:
+            rag_prompt = f"""Seasonal Information:
 {context_combined}
 
-User Question: {user_question}
-
-Please provide clear, organized information about produce that is currently in season. Include specific fruits and vegetables, and any relevant tips about quality, selection, or availability.
-"""
+User Question: {user_question}"""
 
             # Use LLM to generate response
-            llm = self.llm_service.clone(system_prompt="")
-            llm_response = await llm.acomplete(rag_prompt)
+            llm_response = await self.llm_service.acomplete(rag_prompt, system_prompt=_IN_SEASON_RAG_PROMPT)
 
             if llm_response and llm_response.strip():
                 return llm_response.strip()
@@ -1204,22 +1387,13 @@ Please provide clear, organized information about produce that is currently in s
             context_combined = "\n".join(context_texts)
 
             # Create RAG prompt
-            rag_prompt = f"""
-You are a fresh produce expert providing objective advice about fruits and vegetables. Do not mention ordering, marketplace, suppliers, customers, or KCartBot. Focus only on the produce-related question.
-
-Based on the following information about fresh produce, provide a helpful and accurate answer to the user's question.
-
-Reference Information:
+            rag_prompt = f"""Reference Information:
 {context_combined}
 
-User Question: {question}
-
-Please provide a clear, helpful answer that addresses the user's question using the information provided above. Focus on practical, actionable advice related to fresh produce.
-"""
+User Question: {question}"""
 
             # Use LLM to generate response
-            llm = self.llm_service.clone(system_prompt="")
-            llm_response = await llm.acomplete(rag_prompt)
+            llm_response = await self.llm_service.acomplete(rag_prompt, system_prompt=_ADVISORY_RAG_PROMPT)
 
             if llm_response and llm_response.strip():
                 return llm_response.strip()
@@ -1247,15 +1421,10 @@ Please provide a clear, helpful answer that addresses the user's question using
         # Handle case where order_items is a string (product name) instead of list
         if isinstance(order_items, str):
             # Try to parse quantity, unit, and product from string like "2 kilo mango"
-            import re
-            match = re.match(r'(\d+(?:\.\d+)?)\s*(kilo|kg|liter|liters?)\s+(.+)', order_items.lower())
+            match = _ORDER_TEXT_RE.match(order_items.lower())
             if match:
                 quantity = float(match.group(1))
-                unit = match.group(2)
-                if unit in ['kilo', 'kg']:
-                    unit = 'kg'
-                elif unit in ['liter', 'liters']:
-                    unit = 'liter'
+                unit = _ORDER_UNIT_ALIASES[match.group(2)]
                 product_name = match.group(3).strip()
                 order_items = [{"product_name": product_name, "quantity": quantity, "unit": unit}]
             else:
@@ -1288,36 +1457,44 @@ Please provide a clear, helpful answer that addresses the user's question using
                     product_groups[product_name] = 0
                 product_groups[product_name] += quantity
 
-            # Process each unique product
-            for product_name, total_quantity in product_groups.items():
-
-                # Find the product by any name
-                product = await self.database_tool.run({
+            # Resolve every product, then every product's listings, as one concurrent batch each
+            # instead of two sequential round-trips per product; failures surface in order
+            product_names = list(product_groups)
+            products = await self._run_tool_batch([
+                (self.database_tool, {
                     "table": "products",
                     "method": "find_product_by_any_name",
                     "args": [product_name],
                     "kwargs": {}
                 })
-
+                for product_name in product_names
+            ])
+            for product_name, product in zip(product_names, products):
+                if isinstance(product, Exception):
+                    raise product
                 if not product:
                     return self._get_multilingual_response("product_not_available", language, product_name=product_name)
 
-                # Get supplier products for this product
-                supplier_id = session_context.get("supplier_id")
-                if supplier_id:
-                    supplier_products = await self.database_tool.run({
-                        "table": "supplier_products",
-                        "method": "list_supplier_products",
-                        "args": [],
-                        "kwargs": {"filters": {"product": product["product_id"], "supplier": supplier_id}}
-                    })
-                else:
-                    supplier_products = await self.database_tool.run({
-                        "table": "supplier_products",
-                        "method": "list_supplier_products",
-                        "args": [],
-                        "kwargs": {"filters": {"product": product["product_id"]}}
-                    })
+            # Get supplier products for each product
+            supplier_id = session_context.get("supplier_id")
+            listings = await self._run_tool_batch([
+                (self.database_tool, {
+                    "table": "supplier_products",
+                    "method": "list_supplier_products",
+                    "args": [],
+                    "kwargs": {"filters": (
+                        {"product": product["product_id"], "supplier": supplier_id}
+                        if supplier_id else {"product": product["product_id"]}
+                    )}
+                })
+                for product in products
+            ])
+
+            # Process each unique product
+            for product_name, supplier_products in zip(product_names, listings):
+                total_quantity = product_groups[product_name]
+                if isinstance(supplier_products, Exception):
+                    raise supplier_products
 
                 if not supplier_products:
                     return self._get_multilingual_response("product_not_available", language, product_name=product_name)
@@ -1382,29 +1559,39 @@ Please provide a clear, helpful answer that addresses the user's question using
 
             # Create order items
             for detail in order_details:
-                logger.info(f"Creating order item for product {detail['product']['product_id']} from supplier {detail['supplier']['user_id']}")
-                # Get the product and supplier model instances
-                product_instance = await self.database_tool.run({
-                    "table": "products",
-                    "method": "get_product_by_id",
-                    "args": [detail["product"]["product_id"]],
-                    "kwargs": {},
-                    "raw_instances": True
-                })
-
-                supplier_instance = await self.database_tool.run({
-                    "table": "users",
-                    "method": "get_user_by_id",
-                    "args": [detail["supplier"]["user_id"]],
-                    "kwargs": {},
-                    "raw_instances": True
-                })
+                logger.info(
+                    "Creating order item for product %s from supplier %s",
+                    detail['product']['product_id'], detail['supplier']['user_id'],
+                )
+                # Get the product and supplier model instances; the lookups are independent
+                product_instance, supplier_instance = await self._run_tool_batch([
+                    (self.database_tool, {
+                        "table": "products",
+                        "method": "get_product_by_id",
+                        "args": [detail["product"]["product_id"]],
+                        "kwargs": {},
+                        "raw_instances": True
+                    }),
+                    (self.database_tool, {
+                        "table": "users",
+                        "method": "get_user_by_id",
+                        "args": [detail["supplier"]["user_id"]],
+                        "kwargs": {},
+                        "raw_instances": True
+                    }),
+                ])
+                for instance in (product_instance, supplier_instance):
+                    if isinstance(instance, Exception):
+                        raise instance
 
                 if not product_instance or not supplier_instance:
                     logger.error(f"Failed to get product or supplier instances: product_instance={product_instance}, supplier_instance={supplier_instance}")
                     return self._get_multilingual_response("product_supplier_not_found", language)
 
-                logger.info(f"Creating order item with order={transaction}, product={product_instance}, supplier={supplier_instance}")
+                logger.info(
+                    "Creating order item with order=%s, product=%s, supplier=%s",
+                    transaction, product_instance, supplier_instance,
+                )
                 await self.database_tool.run({
                     "table": "order_items",
                     "method": "create_order_item",
@@ -1419,7 +1606,7 @@ Please provide a clear, helpful answer that addresses the user's question using
                         "subtotal": detail["subtotal"]
                     }
                 })
-                logger.info(f"Order item created successfully")
+                logger.info("Order item created successfully")
 
                 # Update supplier inventory
                 new_quantity = available_quantity - detail["quantity"]
@@ -1429,7 +1616,10 @@ Please provide a clear, helpful answer that addresses the user's question using
                     "args": [supplier_product["inventory_id"]],
                     "kwargs": {"quantity_available": new_quantity}
                 })
-                logger.info(f"Updated supplier inventory: {supplier_product['inventory_id']} now has {new_quantity} {detail['unit']} available")
+                logger.info(
+                    "Updated supplier inventory: %s now has %s %s available",
+                    supplier_product['inventory_id'], new_quantity, detail['unit'],
+                )
 
             return self._get_multilingual_response("order_placed", language, total_price=total_price)
 
@@ -1540,36 +1730,42 @@ Please provide a clear, helpful answer that addresses the user's question using
             if not transactions:
                 return self._get_multilingual_response("no_deliveries", "english")
 
-            # If a specific date is requested, filter by delivery date
-            if date_filter:
-                resolved_date = await self.date_resolver.run(date_filter)
-                date_str = resolved_date.strftime('%Y-%m-%d')
-                
+            # Apply the delivery date and order reference filters in a single pass
+            if date_filter or order_ref:
+                date_str = None
+                if date_filter:
+                    resolved_date = await self.date_resolver.run(date_filter)
+                    date_str = resolved_date.strftime('%Y-%m-%d')
+
+                date_matched = False
                 filtered_transactions = []
                 for transaction in transactions:
-                    delivery_date = transaction.get("delivery_date")
-                    if delivery_date:
+                    if date_str is not None:
+                        delivery_date = transaction.get("delivery_date")
+                        if not delivery_date:
+                            continue
                         # Convert delivery_date to date string for comparison
-                        if isinstance(delivery_date, str):
-                            if 'T' in delivery_date:
-                                delivery_date = delivery_date.split('T')[0]
-                        if delivery_date == date_str:
-                            filtered_transactions.append(transaction)
+                        if isinstance(delivery_date, str) and 'T' in delivery_date:
+                            delivery_date = delivery_date.split('T')[0]
+                        if delivery_date != date_str:
+                            continue
+                        date_matched = True
+                    if order_ref and not transaction.get("order_id", "").startswith(order_ref):
+                        continue
+                    filtered_transactions.append(transaction)
                 transactions = filtered_transactions
 
-                if not transactions:
+                if date_str is not None and not date_matched:
                     return self._get_multilingual_response("no_deliveries_date", "english", date=resolved_date.strftime('%B %d, %Y'))
-
-            # If a specific order reference is requested, filter to that order
-            if order_ref:
-                transactions = [t for t in transactions if t.get("order_id", "").startswith(order_ref)]
                 if not transactions:
                     return f"I couldn't find an order with reference '{order_ref}'." # Needs translation
 
             # Format the response
             response_parts = ["Your deliveries:"]
+            shown_transactions = transactions[:10]  # Limit to 10 orders
+            product_names_by_order = await self._index_order_product_names(shown_transactions)
 
-            for transaction in transactions[:10]:  # Limit to 10 orders
+            for transaction in shown_transactions:
                 order_id = transaction.get("order_id", "Unknown")[:8]
                 delivery_date = transaction.get("delivery_date")
                 status = transaction.get("status", "Unknown")
@@ -1583,44 +1779,13 @@ Please provide a clear, helpful answer that addresses the user's question using
                             if 'T' in delivery_date:
                                 delivery_date = delivery_date.split('T')[0]
                             # Try to parse and format the date
-                            from datetime import datetime
-                            date_obj = datetime.fromisoformat(delivery_date.replace('Z', '+00:00'))
-                            date_str = date_obj.strftime('%B %d, %Y')
+                            date_str = _format_iso_date(delivery_date, '%B %d, %Y')
                         else:
                             date_str = str(delivery_date)
                     except Exception:
                         date_str = str(delivery_date)
 
-                # Get order items to show product names
-                product_names = []
-                try:
-                    order_items = await self.database_tool.run({
-                        "table": "order_items",
-                        "method": "list_order_items",
-                        "args": [],
-                        "kwargs": {"filters": {"order": transaction.get("order_id")}}
-                    })
-                    
-                    if order_items:
-                        for item in order_items:
-                            product_data = item.get("product")
-                            if product_data:
-                                # product_data is already a dict with product details
-                                if isinstance(product_data, dict):
-                                    product_names.append(product_data.get("product_name_en", "Unknown Product"))
-                                else:
-                                    # Fallback: if it's just an ID, fetch the product
-                                    product = await self.database_tool.run({
-                                        "table": "products",
-                                        "method": "get_product_by_id",
-                                        "args": [product_data],
-                                        "kwargs": {}
-                                    })
-                                    if product:
-                                        product_names.append(product.get("product_name_en", "Unknown Product"))
-                except Exception as e:
-                    logger.warning(f"Failed to get product names for order {transaction.get('order_id', 'unknown')}: {e}")
-                
+                product_names = product_names_by_order.get(transaction.get("order_id"), [])
                 product_list = ", ".join(product_names) if product_names else "Unknown Products"
                 
                 # Change status display: show "on delivery" instead of "Pending"
@@ -1639,6 +1804,61 @@ Please provide a clear, helpful answer that addresses the user's question using
             logger.error(f"Failed to check customer deliveries: {exc}")
             return self._get_multilingual_response("deliveries_failed", "english")
 
+    async def _index_order_product_names(
+        self, transactions: List[Dict[str, Any]]
+    ) -> Dict[str, List[str]]:
+        """Map each order id to its product names using one order-item query.
+
+        Replaces a list_order_items call per order; products that come back as bare
+        ids are fetched once each no matter how many orders reference them.
+        """
+        order_ids = [t["order_id"] for t in transactions if t.get("order_id")]
+        if not order_ids:
+            return {}
+
+        try:
+            order_items = await self.database_tool.run({
+                "table": "order_items",
+                "method": "list_order_items",
+                "args": [],
+                "kwargs": {"filters": {"order_id": {"lookup": "in", "value": order_ids}}}
+            })
+        except Exception as e:
+            logger.warning(f"Failed to get product names for orders {order_ids}: {e}")
+            return {}
+
+        names_by_order: Dict[str, List[str]] = {}
+        names_by_product_id: Dict[Any, Optional[str]] = {}
+        for item in order_items or []:
+            order = item.get("order")
+            order_id = order.get("order_id") if isinstance(order, dict) else order
+            product_data = item.get("product")
+            if not product_data:
+                continue
+            # product_data is normally a dict with product details
+            if isinstance(product_data, dict):
+                name = product_data.get("product_name_en", "Unknown Product")
+            else:
+                # Fallback: if it's just an ID, fetch the product once
+                if product_data not in names_by_product_id:
+                    try:
+                        product = await self.database_tool.run({
+                            "table": "products",
+                            "method": "get_product_by_id",
+                            "args": [product_data],
+                            "kwargs": {}
+                        })
+                    except Exception as e:
+                        logger.warning(f"Failed to get product {product_data}: {e}")
+                        product = None
+                    names_by_product_id[product_data] = (
+                        product.get("product_name_en", "Unknown Product") if product else None
+                    )
+                name = names_by_product_id[product_data]
+            if name:
+                names_by_order.setdefault(str(order_id), []).append(name)
+        return names_by_order
+
     # Supplier flow handlers
     async def _handle_supplier_registration(
         self, filled_slots: Dict[str, Any], missing_slots: List[str], session_context: Dict[str, Any]
@@ -1780,9 +2000,7 @@ Please provide a clear, helpful answer that addresses the user's question using
 
         # Check if this supplier already has this product and user wants to add to existing
         user_message = session_context.get("last_user_message", "").lower()
-        is_existing_inventory_request = any(keyword in user_message for keyword in [
-            "existing", "inventory", "add more", "add to my", "more to my", "increase my"
-        ])
+        is_existing_inventory_request = _EXISTING_INVENTORY_RE.search(user_message) is not None
 
         if is_existing_inventory_request:
             try:
@@ -1850,14 +2068,17 @@ Please provide a clear, helpful answer that addresses the user's question using
                     "kwargs": {"filters": {"product": product["product_id"]}}
                 })
 
-                if competitor_prices:
-                    prices = [cp.get("price_etb_per_kg", 0) for cp in competitor_prices if cp.get("price_etb_per_kg", 0) > 0]
-                    if prices:
-                        avg_price = sum(prices) / len(prices)
-                        min_price = min(prices)
-                        max_price = max(prices)
+                price_stats = _positive_price_stats(competitor_prices) if competitor_prices else None
+                if price_stats:
+                    avg_price, min_price, max_price = price_stats
 
-                        suggestion_text = f" 📊 **Market Insights for {product_name}:** • Average market price: {avg_price:.1f} ETB/kg • Price range: {min_price:.1f} - {max_price:.1f} ETB/kg • Suggested competitive range: {max(min_price * 0.9, avg_price * 0.85):.1f} - {min(max_price * 1.1, avg_price * 1.15):.1f} ETB/kg"
+                    suggestion_text = (
+                        f" 📊 **Market Insights for {product_name}:** "
+                        f"• Average market price: {avg_price:.1f} ETB/kg "
+                        f"• Price range: {min_price:.1f} - {max_price:.1f} ETB/kg "
+                        f"• Suggested competitive range: {max(min_price * 0.9, avg_price * 0.85):.1f} - "
+                        f"{min(max_price * 1.1, avg_price * 1.15):.1f} ETB/kg"
+                    )
 
             return f"I'll add {quantity} kg of {product_name}.{suggestion_text} {self._get_multilingual_response('what_price', language)}"
 
@@ -2108,7 +2329,7 @@ Please provide a clear, helpful answer that addresses the user's question using
         product_name = pending_product.get("product_name", "this product")
 
         # Handle cases where user says no expiry or similar
-        if expiry_date_input and any(word in expiry_date_input.lower() for word in ["no", "none", "doesn't", "never", "no expiry"]):
+        if expiry_date_input and _NO_EXPIRY_RE.search(expiry_date_input.lower()):
             pending_product["expiry_date"] = None
             return self._get_multilingual_response("no_expiry_noted", language, product_name=product_name)
 
@@ -2220,8 +2441,10 @@ Please provide a clear, helpful answer that addresses the user's question using
                 return self._get_multilingual_response("no_inventory", language)
 
             response_parts = [self._get_multilingual_response("inventory_header", language)]
+            # Resolve the per-item template once; each listing then only needs a format call
+            item_template = self._get_multilingual_response("inventory_item", language)
             for product in products:
-                name = product.get("product", {}).get("product_name_en", "Unknown")
+                name = product.get("product", _EMPTY_ROW).get("product_name_en", "Unknown")
                 quantity = product.get("quantity_available", 0)
                 unit = product.get("unit", "kg")
                 price = product.get("unit_price_etb", 0)
@@ -2233,22 +2456,20 @@ Please provide a clear, helpful answer that addresses the user's question using
                 expiry_info = ""
                 if expiry_date:
                     try:
-                        from datetime import datetime
                         if isinstance(expiry_date, str):
                             if 'T' in expiry_date:
                                 expiry_date = expiry_date.split('T')[0]
-                            date_obj = datetime.fromisoformat(expiry_date.replace('Z', '+00:00'))
-                            expiry_info = f" • Expires: {date_obj.strftime('%b %d, %Y')}"
+                            expiry_info = f" • Expires: {_format_iso_date(expiry_date, '%b %d, %Y')}"
                         else:
                             expiry_info = f" • Expires: {expiry_date}"
                     except:
                         expiry_info = f" • Expires: {expiry_date}"
 
                 # Format status with emoji
-                status_emoji = "✅" if status == "active" else "⏸️" if status == "on_sale" else "❌"
+                status_emoji = _STOCK_STATUS_EMOJI.get(status, "❌")
 
                 response_parts.append(
-                    self._get_multilingual_response("inventory_item", language,
+                    item_template.format(
                         status_emoji=status_emoji, name=name, quantity=quantity, unit=unit,
                         price=price, delivery_days=delivery_days, expiry_info=expiry_info)
                 )
@@ -2295,9 +2516,6 @@ Please provide a clear, helpful answer that addresses the user's question using
         """View delivery schedule."""
         language = session_context.get("detected_language", "english")
         date_range = filled_slots.get("date_range")
-        query = "your delivery schedule"
-        if date_range:
-            query += f" for {date_range}"
 
         return self._get_multilingual_response("delivery_schedule", language, date_range=date_range or "all dates")
 
@@ -2330,32 +2548,35 @@ Please provide a clear, helpful answer that addresses the user's question using
             if not order_items:
                 return self._get_multilingual_response("no_deliveries_date", language, date=resolved_date.strftime('%B %d, %Y'))
 
-            # Filter by delivery date from transactions
-            deliveries_today = []
-            for item in order_items:
-                # Get the transaction for this order item
-                transaction = await self.database_tool.run({
-                    "table": "transactions",
-                    "method": "get_transaction_by_id",
-                    "args": [item["order"]["order_id"]],
-                    "kwargs": {}
-                })
+            # Items of the same order share one transaction; look each up once
+            transactions = await self._fetch_order_transactions(order_items)
 
+            # Decide once per transaction whether it is an open delivery on that date;
+            # items of the same order then only need a set lookup
+            due_order_ids = set()
+            for order_id, transaction in transactions.items():
                 if transaction and transaction.get("delivery_date"):
                     # Check if delivery date matches (compare date parts only)
                     delivery_date = transaction["delivery_date"]
                     if isinstance(delivery_date, str):
                         delivery_date = delivery_date.split('T')[0]  # Remove time part if present
 
-                    if delivery_date == date_str and transaction.get("status") in ["Confirmed", "Pending"]:
-                        deliveries_today.append({
-                            "order_id": transaction["order_id"],
-                            "customer": transaction.get("user", "Unknown customer"),
-                            "product": item.get("product", "Unknown product"),
-                            "quantity": item.get("quantity", 0),
-                            "unit": item.get("unit", "kg"),
-                            "status": transaction.get("status", "Unknown")
-                        })
+                    if delivery_date == date_str and transaction.get("status") in _OPEN_ORDER_STATUSES:
+                        due_order_ids.add(order_id)
+
+            deliveries_today = []
+            for item in order_items:
+                order_id = item["order"]["order_id"]
+                if order_id in due_order_ids:
+                    transaction = transactions[order_id]
+                    deliveries_today.append({
+                        "order_id": transaction["order_id"],
+                        "customer": transaction.get("user", "Unknown customer"),
+                        "product": item.get("product", "Unknown product"),
+                        "quantity": item.get("quantity", 0),
+                        "unit": item.get("unit", "kg"),
+                        "status": transaction.get("status", "Unknown")
+                    })
 
             if not deliveries_today:
                 return self._get_multilingual_response("no_deliveries_date", language, date=resolved_date.strftime('%B %d, %Y'))
@@ -3,11 +3,16 @@ Multilingual response dictionary for KCartBot agent.
 Contains translations for all user-facing messages in English, Amharic, and Phonetic Amharic.
 """
 
+from functools import lru_cache
 from typing import Dict
 
 
+@lru_cache(maxsize=1)
 def get_multilingual_response_dictionary() -> Dict[str, Dict[str, str]]:
-    """Get the complete multilingual response dictionary."""
+    """Get the complete multilingual response dictionary.
+
+    The dictionary is built once and shared by every caller, so treat it as read-only.
+    """
     return {
         # Greetings and general
         "greeting": {
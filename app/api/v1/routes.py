@@ -33,7 +33,7 @@ class ChatResponse(BaseModel):
 
 
 @router.post("/chat", response_model=ChatResponse, tags=["chat"])
-async def chat_with_bot(request: ChatRequest) -> ChatResponse:
+async def chat_with_bot(request: ChatRequest) -> Dict[str, Any]:
     """
     Send a message to the KCartBot assistant.
 
@@ -47,7 +47,9 @@ async def chat_with_bot(request: ChatRequest) -> ChatResponse:
             user_context=request.user_context
         )
 
-        return ChatResponse(**result)
+        # FastAPI validates the dict against response_model once; building ChatResponse here
+        # would walk the full chat history again when it is dumped and re-validated
+        return result
 
     except Exception as exc:
         raise HTTPException(
@@ -1,6 +1,9 @@
 """Milvus vector database handler for managing vector operations."""
 
-from typing import List, Dict, Any, Optional, Union
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional, TypeVar, Union
 from pymilvus import (
     connections,
     Collection,
@@ -16,6 +19,27 @@ from functools import wraps
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# pymilvus is synchronous; blocking calls on the request path run on one
+# process-wide worker pool that is started on first use and reused thereafter.
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="milvus")
+    return _EXECUTOR
+
+
+async def _run_blocking(func: Callable[[], T]) -> T:
+    """Run a blocking pymilvus call off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), func)
+
 
 def ensure_connection(func):
     """Decorator to ensure Milvus connection is active before operations."""
@@ -418,7 +442,7 @@ class MilvusHandler:
         Returns:
             List of search results for each query vector
         """
-        try:
+        def _search():
             collection = self.get_collection(collection_name)
             
             # Load collection if not loaded
@@ -432,7 +456,7 @@ class MilvusHandler:
             default_params = {"nprobe": 10}
             search_params = params or default_params
             
-            results = collection.search(
+            return collection.search(
                 data=query_vectors,
                 anns_field=field_name,
                 param=search_params,
@@ -441,6 +465,9 @@ class MilvusHandler:
                 output_fields=output_fields,
                 partition_names=partition_names,
             )
+
+        try:
+            results = await _run_blocking(_search)
             
             # Format results
             formatted_results = []
@@ -457,7 +484,7 @@ class MilvusHandler:
                     hit_list.append(hit_dict)
                 formatted_results.append(hit_list)
             
-            logger.info(f"Searched '{collection_name}' with {len(query_vectors)} query vectors")
+            logger.info("Searched '%s' with %d query vectors", collection_name, len(query_vectors))
             return formatted_results
             
         except Exception as e:
@@ -499,7 +526,7 @@ class MilvusHandler:
                 limit=limit,
             )
             
-            logger.info(f"Queried '{collection_name}' with expression: {expr}")
+            logger.info("Queried '%s' with expression: %s", collection_name, expr)
             return results
             
         except Exception as e:
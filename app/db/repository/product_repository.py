@@ -4,10 +4,12 @@ import re
 from app.db.models import Product
 from tortoise.exceptions import DoesNotExist
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
 class ProductRepository:
     @staticmethod
     def _normalise_text(value: str) -> str:
-        return re.sub(r"\s+", " ", value.strip().lower())
+        return _WHITESPACE_RE.sub(" ", value.strip().lower())
 
     @staticmethod
     async def create_product(**kwargs):
@@ -41,7 +43,10 @@ class ProductRepository:
                 return product
 
         # Try case-insensitive substring matches for simple typos/spacing variations.
-        substring_candidates = {raw, raw.lower(), cls._normalise_text(raw)}
+        # ``icontains`` already folds case, so only the whitespace-normalised form can
+        # add anything over ``raw``; skip it when it would repeat the same queries.
+        target = cls._normalise_text(raw)
+        substring_candidates = [raw] if target == raw.lower() else [raw, target]
         for candidate in substring_candidates:
             for field in ("product_name_en", "product_name_am", "product_name_am_latin"):
                 product = await Product.filter(**{f"{field}__icontains": candidate}).first()
@@ -53,7 +58,7 @@ class ProductRepository:
         if not products:
             return None
 
-        target = cls._normalise_text(raw)
+        normalise = cls._normalise_text
         variant_map = {}
         for product in products:
             for variant in (
@@ -63,7 +68,7 @@ class ProductRepository:
             ):
                 if not variant:
                     continue
-                key = cls._normalise_text(str(variant))
+                key = normalise(str(variant))
                 variant_map.setdefault(key, product)
 
         close = difflib.get_close_matches(target, variant_map.keys(), n=1, cutoff=0.7)
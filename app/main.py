@@ -1,9 +1,12 @@
 """Application entry point for KcartBot."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes import router as api_router
+from app.api.v1.routes import chat_service
 from app.core.tortoise_config import init_db, close_db
 
 
@@ -37,8 +40,11 @@ async def lifespan(app: FastAPI):
 	try:
 		yield
 	finally:
-		# Shutdown
-		await close_db()
+		# Shutdown: agent tools and the ORM pool are independent, so tear them down together
+		results = await asyncio.gather(chat_service.aclose(), close_db(), return_exceptions=True)
+		for result in results:
+			if isinstance(result, BaseException):
+				raise result
 
 
 app = FastAPI(
@@ -49,6 +55,8 @@ app = FastAPI(
 	redoc_url="/redoc",
 	openapi_tags=TAGS_METADATA,
 	lifespan=lifespan,
+	# Chat responses carry the whole session history; orjson encodes it far faster than stdlib json.
+	default_response_class=ORJSONResponse,
 )
 app.include_router(api_router, prefix="/api")
 
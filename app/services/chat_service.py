@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 from typing import Any, Dict, Optional
 from uuid import uuid4
@@ -20,6 +20,8 @@ class ChatService:
         self.agent = Agent()
         # In production, this would be a proper database/cache
         self._sessions: Dict[str, Dict[str, Any]] = {}
+        # One lock per session so concurrent requests cannot interleave a session's turns
+        self._session_locks: Dict[str, asyncio.Lock] = {}
 
     async def process_message(
         self,
@@ -43,31 +45,43 @@ class ChatService:
             if not session_id:
                 session_id = str(uuid4())
                 self._sessions[session_id] = self._create_new_session(user_context or {}, session_id)
-                logger.info(f"Created new session: {session_id}")
+                logger.info("Created new session: %s", session_id)
             elif session_id not in self._sessions:
                 # Use the provided session_id to create a new session
                 self._sessions[session_id] = self._create_new_session(user_context or {}, session_id)
-                logger.info(f"Created new session with provided ID: {session_id}")
+                logger.info("Created new session with provided ID: %s", session_id)
             else:
-                logger.info(f"Using existing session: {session_id}")
+                logger.info("Using existing session: %s", session_id)
 
-            session_context = self._sessions[session_id]
+            # Turns of the same session run one at a time, so the context is read,
+            # updated and reported without another turn mutating it underneath
+            async with self._session_locks.setdefault(session_id, asyncio.Lock()):
+                session_context = self._sessions.get(session_id)
+                if session_context is None:
+                    # The session was ended while this turn waited for the lock; start it afresh
+                    session_context = self._sessions[session_id] = self._create_new_session(user_context or {}, session_id)
 
-            # Update session with user context if provided
-            if user_context:
-                session_context.update(user_context)
+                # Update session with user context if provided
+                if user_context:
+                    session_context.update(user_context)
 
-            # Process the message with the agent
-            result = await self.agent.process_message(user_message, session_context)
+                # Process the message with the agent
+                result = await self.agent.process_message(user_message, session_context)
 
-            # Update the session with the new context
-            self._sessions[session_id] = result.get("session_context", session_context)
+                # Update the session with the new context, unless it was ended or restarted during the turn
+                if self._sessions.get(session_id) is session_context:
+                    self._sessions[session_id] = result.get("session_context", session_context)
+                chat_history = list(session_context.get("chat_history", []))
+
+            # A session ended mid-turn kept its lock for this turn; release it now
+            if session_id not in self._sessions:
+                self._discard_session_lock(session_id)
 
             # Prepare response
             response = {
                 "session_id": session_id,
                 "response": result.get("response", ""),
-                "chat_history": session_context.get("chat_history", []),
+                "chat_history": chat_history,
                 "intent_info": result.get("intent_info", {}),
                 "timestamp": self._get_current_timestamp(),
             }
@@ -104,6 +118,10 @@ class ChatService:
             "last_activity": self._get_current_timestamp(),
         }
 
+    async def aclose(self) -> None:
+        """Release resources held by the underlying agent."""
+        await self.agent.aclose()
+
     def get_session_context(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get the context for a specific session."""
         return self._sessions.get(session_id)
@@ -122,6 +140,7 @@ class ChatService:
         if session_id in self._sessions:
             # Could add cleanup logic here
             del self._sessions[session_id]
+            self._discard_session_lock(session_id)
             logger.info(f"Ended session: {session_id}")
             return True
         return False
@@ -159,10 +178,17 @@ class ChatService:
 
         for session_id in sessions_to_remove:
             del self._sessions[session_id]
+            self._discard_session_lock(session_id)
             logger.info(f"Cleaned up inactive session: {session_id}")
 
         return len(sessions_to_remove)
 
+    def _discard_session_lock(self, session_id: str) -> None:
+        """Forget a session's lock unless a turn holds it; that turn drops it when done."""
+        lock = self._session_locks.get(session_id)
+        if lock is not None and not lock.locked():
+            del self._session_locks[session_id]
+
     @staticmethod
     def _get_current_timestamp() -> str:
         """Get current timestamp in ISO format."""
@@ -190,15 +216,23 @@ class ChatService:
         # Get last few messages for summary
         recent_messages = chat_history[-6:]  # Last 3 exchanges
 
-        # Create a simple summary
-        user_messages = [msg for msg in recent_messages if msg.get("role") == "user"]
-        assistant_messages = [msg for msg in recent_messages if msg.get("role") == "assistant"]
+        # Walk back from the newest message and stop once both roles are found
+        last_user_message = None
+        last_assistant_message = None
+        for msg in reversed(recent_messages):
+            role = msg.get("role")
+            if role == "user" and last_user_message is None:
+                last_user_message = msg["content"]
+            elif role == "assistant" and last_assistant_message is None:
+                last_assistant_message = msg["content"]
+            if last_user_message is not None and last_assistant_message is not None:
+                break
 
         summary = {
             "session_id": session_id,
             "message_count": message_count,
-            "last_user_message": user_messages[-1]["content"] if user_messages else None,
-            "last_assistant_message": assistant_messages[-1]["content"] if assistant_messages else None,
+            "last_user_message": last_user_message,
+            "last_assistant_message": last_assistant_message,
             "current_intent": session.get("current_intent"),
             "current_flow": session.get("current_flow"),
             "user_role": session.get("user_role"),
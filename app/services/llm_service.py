@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
+import os
+import re
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from time import perf_counter
-from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterable, List, Mapping, Optional
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence
 
 import httpx
 
@@ -14,10 +15,101 @@ from langchain_core.caches import BaseCache as _LCBaseCache  # type: ignore
 from langchain_core.callbacks import Callbacks as _LCCallbacks  # type: ignore
 
 from app.core.config import get_settings
+from app.utils import json_utils
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Process-wide cap on in-flight DeepSeek requests so concurrent turns queue
+# instead of stampeding the endpoint into 429s and backoff retries. Like the
+# shared client below, it is bound to a loop, so each new loop gets its own.
+_LLM_CONCURRENCY = int(os.getenv("KCART_LLM_CONCURRENCY", "8"))
+_LLM_SEMAPHORE: Optional[asyncio.Semaphore] = None
+_LLM_SEMAPHORE_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+# Pooled HTTP client shared by every LLMService without an injected client, created
+# lazily on first use so requests reuse TCP/TLS connections instead of handshaking
+# each time. httpx clients are bound to the loop they run on, so a new loop gets a
+# fresh client.
+_SHARED_CLIENT: Optional[httpx.AsyncClient] = None
+_SHARED_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+# Error text that marks a failure as transient; one compiled scan instead of a substring test per marker.
+_TRANSIENT_ERROR_RE = re.compile(
+    "|".join(map(re.escape, (
+        "connection refused",
+        "timeout",
+        "temporary failure",
+        "429",
+        "rate limit",
+        "overloaded",
+    ))),
+    re.IGNORECASE,
+)
+
+
+def _get_shared_client() -> httpx.AsyncClient:
+    global _SHARED_CLIENT, _SHARED_CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _SHARED_CLIENT is None or _SHARED_CLIENT.is_closed or _SHARED_CLIENT_LOOP is not loop:
+        _discard_client(_SHARED_CLIENT, _SHARED_CLIENT_LOOP)
+        _SHARED_CLIENT = httpx.AsyncClient()
+        _SHARED_CLIENT_LOOP = loop
+    return _SHARED_CLIENT
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    global _LLM_SEMAPHORE, _LLM_SEMAPHORE_LOOP
+    loop = asyncio.get_running_loop()
+    if _LLM_SEMAPHORE is None or _LLM_SEMAPHORE_LOOP is not loop:
+        _LLM_SEMAPHORE = asyncio.Semaphore(_LLM_CONCURRENCY)
+        _LLM_SEMAPHORE_LOOP = loop
+    return _LLM_SEMAPHORE
+
+
+def _discard_client(
+    client: Optional[httpx.AsyncClient], loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Close a pooled client left behind by another event loop.
+
+    The client can only be closed on the loop that opened it, so the close is
+    scheduled there while that loop still runs; a closed loop took its
+    connections with it, and a stopped one cannot be driven from here.
+    """
+    if client is None or client.is_closed or loop is None or loop.is_closed():
+        return
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        logger.debug("Dropping HTTP client of a stopped event loop without closing it")
+
+
+async def aclose_shared_client() -> None:
+    """Close the pooled HTTP client, if one was opened on the running loop."""
+    global _SHARED_CLIENT, _SHARED_CLIENT_LOOP
+    client = _SHARED_CLIENT
+    if client is None or _SHARED_CLIENT_LOOP is not asyncio.get_running_loop():
+        return
+    _SHARED_CLIENT = None
+    _SHARED_CLIENT_LOOP = None
+    await client.aclose()
+
+# Kept flush-left so no request pays for indentation tokens.
+DEFAULT_SYSTEM_PROMPT = """\
+You are KCartBot, a warm and efficient assistant for Ethiopia's fresh-goods marketplace. Keep every reply to one short paragraph and follow these guardrails:
+- Identify whether the user is a customer or supplier and stay within that flow.
+- Customers: gather missing name, phone, and delivery location if they're new. For orders capture items with kg or liter units, confirm availability, ask for delivery date/location, present a concise ETB summary, remind them payment is Cash on Delivery, then confirm once details and order items succeed.
+- Suppliers: help onboard quickly, collect product name, quantity, unit price, delivery schedule, and expiry one detail at a time, and share pricing guidance before submitting inventory updates.
+- Always use ETB currency and kg/liter units, reuse known context, ask for missing details individually, and keep the tone pragmatic and friendly.
+- When unsure, ask clarifying questions instead of guessing, and avoid multi-step instructions in a single reply.
+"""
+
+# History roles passed through to DeepSeek as-is; any other role is sent as "user".
+_ROLE_MAP: Dict[str, str] = {
+    "assistant": "assistant",
+    "system": "system",
+}
+
 
 class LLMServiceError(RuntimeError):
     """Raised when the upstream language model request definitively fails."""
@@ -45,18 +137,10 @@ class LLMService:
         system_prompt: Optional[str] = None,
         config: Optional[LLMConfig] = None,
         http_client: Optional[httpx.AsyncClient] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
     ) -> None:
         self.config = config or LLMConfig()
-        self.system_prompt = system_prompt or (
-            """
-            You are KCartBot, a warm and efficient assistant for Ethiopia's fresh-goods marketplace. Keep every reply to one short paragraph and follow these guardrails:
-            - Identify whether the user is a customer or supplier and stay within that flow.
-            - Customers: gather missing name, phone, and delivery location if they're new. For orders capture items with kg or liter units, confirm availability, ask for delivery date/location, present a concise ETB summary, remind them payment is Cash on Delivery, then confirm once details and order items succeed.
-            - Suppliers: help onboard quickly, collect product name, quantity, unit price, delivery schedule, and expiry one detail at a time, and share pricing guidance before submitting inventory updates.
-            - Always use ETB currency and kg/liter units, reuse known context, ask for missing details individually, and keep the tone pragmatic and friendly.
-            - When unsure, ask clarifying questions instead of guessing, and avoid multi-step instructions in a single reply.
-            """
-        )
+        self.system_prompt = (system_prompt or DEFAULT_SYSTEM_PROMPT).strip()
         if not self.config.api_key:
             settings = get_settings()
             self.config.api_key = getattr(settings, "deepseek_api_key", None) or getattr(settings, "gemini_api_key", None)
@@ -65,6 +149,8 @@ class LLMService:
             raise RuntimeError("DEEPSEEK_API_KEY is not set in configuration or environment.")
 
         self._external_client = http_client
+        # None defers to the process-wide semaphore of whichever loop makes the request
+        self._semaphore = semaphore
         self._request_timeout = float(self.config.request_timeout or 45.0)
         self._slow_request_threshold = float(self.config.slow_request_threshold or 8.0)
 
@@ -80,8 +166,10 @@ class LLMService:
         history: Optional[Iterable[Mapping[str, str]]],
         *,
         stream: bool = False,
+        system_prompt: Optional[str] = None,
+        stop: Optional[Sequence[str]] = None,
     ) -> Mapping[str, Any]:
-        messages = self._compose_messages(prompt, history)
+        messages = self._compose_messages(prompt, history, system_prompt=system_prompt)
         payload: dict[str, Any] = {
             "model": self.config.model,
             "messages": messages,
@@ -90,24 +178,29 @@ class LLMService:
         }
         if stream:
             payload["stream"] = True
+        if stop:
+            # Let DeepSeek truncate server-side instead of generating and trimming here.
+            payload["stop"] = list(stop)
         return payload
 
+    @staticmethod
+    def _encode_payload(payload: Mapping[str, Any]) -> bytes:
+        # httpx's json= goes through the stdlib encoder; the payload carries the whole
+        # history (often Amharic text), so encode it straight to bytes with orjson instead.
+        return json_utils.dumps_bytes(payload)
+
     async def _post_json(self, payload: Mapping[str, Any]) -> httpx.Response:
         url = f"{self.config.base_url}/chat/completions"
         headers = self._headers()
         timeout = httpx.Timeout(self._request_timeout)
 
-        if self._external_client is not None:
-            response = await self._external_client.post(
-                url,
-                json=payload,
-                headers=headers,
-                timeout=timeout,
-            )
-        else:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(url, json=payload, headers=headers)
-
+        client = self._external_client or _get_shared_client()
+        response = await client.post(
+            url,
+            content=self._encode_payload(payload),
+            headers=headers,
+            timeout=timeout,
+        )
         response.raise_for_status()
         return response
 
@@ -117,33 +210,21 @@ class LLMService:
         headers = self._headers()
         timeout = httpx.Timeout(None, connect=self._request_timeout)
 
-        if self._external_client is not None:
-            async with self._external_client.stream(
-                "POST",
-                url,
-                json=payload,
-                headers=headers,
-                timeout=timeout,
-            ) as response:
-                response.raise_for_status()
-                yield response
-        else:
-            client = httpx.AsyncClient(timeout=timeout)
-            try:
-                async with client.stream(
-                    "POST",
-                    url,
-                    json=payload,
-                    headers=headers,
-                ) as response:
-                    response.raise_for_status()
-                    yield response
-            finally:
-                await client.aclose()
+        client = self._external_client or _get_shared_client()
+        async with client.stream(
+            "POST",
+            url,
+            content=self._encode_payload(payload),
+            headers=headers,
+            timeout=timeout,
+        ) as response:
+            response.raise_for_status()
+            yield response
 
     def update_system_prompt(self, system_prompt: str) -> None:
         """Update the system prompt for future requests."""
-        self.system_prompt = system_prompt or self.system_prompt
+        if system_prompt and system_prompt.strip():
+            self.system_prompt = system_prompt.strip()
 
     def clone(self, system_prompt: Optional[str] = None) -> "LLMService":
         """Return a lightweight copy sharing the same underlying model/config."""
@@ -151,6 +232,7 @@ class LLMService:
             system_prompt=system_prompt or self.system_prompt,
             config=self.config,
             http_client=self._external_client,
+            semaphore=self._semaphore,
         )
 
     async def acomplete(
@@ -158,15 +240,24 @@ class LLMService:
         prompt: str,
         *,
         history: Optional[Iterable[Mapping[str, str]]] = None,
+        system_prompt: Optional[str] = None,
+        stop: Optional[Sequence[str]] = None,
         **kwargs,
     ) -> str:
-        """Generate a single-shot completion asynchronously with retries."""
-        history_list = list(history or [])
-        payload = self._build_payload(prompt, history_list)
+        """Generate a single-shot completion asynchronously with retries.
+
+        ``system_prompt`` overrides the service's system prompt for this call only
+        (an empty string sends no system message) without mutating shared state.
+        ``stop`` sequences are forwarded to the provider, which ends generation there.
+        """
+        # The history is only read here, so reuse a list/tuple as given and copy other iterables once
+        history_list = history if isinstance(history, (list, tuple)) else list(history or ())
+        payload = self._build_payload(prompt, history_list, system_prompt=system_prompt, stop=stop)
 
         async def _call() -> str:
-            response = await self._post_json(payload)
-            data = response.json()
+            async with self._semaphore or _get_llm_semaphore():
+                response = await self._post_json(payload)
+            data = json_utils.loads(response.content)
             try:
                 content = data["choices"][0]["message"]["content"]
             except (KeyError, IndexError) as exc:  # pragma: no cover - defensive
@@ -176,7 +267,6 @@ class LLMService:
         start = perf_counter()
         prompt_chars = len(prompt or "")
         history_entries = len(history_list)
-        history_chars = sum(len(item.get("content", "")) for item in history_list)
         try:
             result = await self._retry(_call, action="completion", metrics=metrics)
         except LLMServiceError:
@@ -188,7 +278,7 @@ class LLMService:
                 attempts,
                 prompt_chars,
                 history_entries,
-                history_chars,
+                self._history_chars(history_list),
                 metrics.get("errors"),
             )
             raise
@@ -202,38 +292,50 @@ class LLMService:
                     attempts,
                     prompt_chars,
                     history_entries,
-                    history_chars,
+                    self._history_chars(history_list),
                 )
             return result
 
+    @staticmethod
+    def _history_chars(history: List[Mapping[str, str]]) -> int:
+        # Only the slow/failed-request logs report this, so the history is not re-walked per call.
+        return sum(len(item.get("content", "")) for item in history)
+
     async def astream(
         self,
         prompt: str,
         *,
         history: Optional[Iterable[Mapping[str, str]]] = None,
+        system_prompt: Optional[str] = None,
+        stop: Optional[Sequence[str]] = None,
         **kwargs,
     ) -> AsyncGenerator[str, None]:
-        """Stream the model's response tokens asynchronously with retries."""
-        payload = self._build_payload(prompt, history, stream=True)
+        """Stream the model's response tokens asynchronously with retries.
+
+        ``system_prompt`` and ``stop`` behave as in :meth:`acomplete`.
+        """
+        payload = self._build_payload(
+            prompt, history, stream=True, system_prompt=system_prompt, stop=stop
+        )
 
         async def _gen():
-            async with self._stream_request(payload) as stream:
+            async with self._semaphore or _get_llm_semaphore(), self._stream_request(payload) as stream:
                 async for line in stream.aiter_lines():
                     if not line:
                         continue
                     if line.startswith(":"):
                         continue  # comment/heartbeat
-                    if line.strip() == "data: [DONE]":
-                        break
                     if not line.startswith("data: "):
                         continue
-                    raw = line.split("data: ", 1)[1].strip()
+                    raw = line[6:].strip()  # drop the "data: " prefix checked above
                     if not raw:
                         continue
+                    if raw == "[DONE]":
+                        break
                     try:
-                        event = json.loads(raw)
+                        event = json_utils.loads(raw)
                         delta = event["choices"][0]["delta"].get("content")
-                    except (json.JSONDecodeError, KeyError, IndexError):
+                    except (json_utils.JSONDecodeError, KeyError, IndexError):
                         logger.debug("Skipping malformed DeepSeek stream chunk: %s", raw)
                         continue
                     if delta:
@@ -260,21 +362,21 @@ class LLMService:
         self,
         prompt: str,
         history: Optional[Iterable[Mapping[str, str]]],
+        system_prompt: Optional[str] = None,
     ) -> List[Mapping[str, str]]:
         messages: List[Mapping[str, str]] = []
-        if self.system_prompt and self.system_prompt.strip():
-            messages.append({"role": "system", "content": self.system_prompt.strip()})
+        system_content = self.system_prompt if system_prompt is None else system_prompt.strip()
+        if system_content:
+            messages.append({"role": "system", "content": system_content})
 
         if history:
             for item in history:
-                role = (item.get("role") or "user").lower()
                 content = (item.get("content") or "").strip()
                 if not content:
                     continue
-                mapped_role = {
-                    "assistant": "assistant",
-                    "system": "system",
-                }.get(role, "user")
+                role = item.get("role") or "user"
+                # Roles are almost always already lower-case; only fold case on a miss.
+                mapped_role = _ROLE_MAP.get(role) or _ROLE_MAP.get(role.lower(), "user")
                 messages.append({"role": mapped_role, "content": content})
 
         messages.append({"role": "user", "content": prompt})
@@ -309,16 +411,7 @@ class LLMService:
     def _should_retry(self, e: Exception, attempt: int) -> bool:
         if attempt >= self.config.max_retries - 1:
             return False
-        transient_errors = (
-            "connection refused",
-            "timeout",
-            "temporary failure",
-            "429",
-            "rate limit",
-            "overloaded",
-        )
-        message = str(e).lower()
-        if any(err in message for err in transient_errors):
+        if _TRANSIENT_ERROR_RE.search(str(e)):
             return True
         return isinstance(e, (httpx.ReadTimeout, httpx.ConnectTimeout, httpx.RemoteProtocolError))
 
@@ -0,0 +1,200 @@
+"""In-process caching helpers for tools whose results are deterministic."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.utils import json_utils
+from app.utils.json_utils import orjson
+
+try:  # pragma: no cover - exercised implicitly depending on the environment
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
+
+_IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None), Decimal)
+
+# Scalar types an orjson round-trip hands back unchanged (floats are checked separately).
+_JSON_SCALAR_TYPES = frozenset({str, int, bool, type(None)})
+
+
+def make_cache_key(payload: Any) -> int:
+    """Return a 64-bit hash of the canonical (sorted-key) JSON form of ``payload``.
+
+    Keys are plain ints so lookups compare a single machine word; xxh3 is used
+    when installed, otherwise an 8-byte blake2b digest.
+    """
+    if isinstance(payload, str):
+        canonical = payload.strip().encode("utf-8")
+    else:
+        canonical = json_utils.dumps_bytes(payload, sort_keys=True)
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(canonical)
+    return int.from_bytes(hashlib.blake2b(canonical, digest_size=8).digest(), "big")
+
+
+def _is_frozen(value: Any) -> bool:
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(_is_frozen(item) for item in value)
+    return False
+
+
+def _is_plain_json(value: Any) -> bool:
+    """Return True when an orjson round-trip of ``value`` reproduces it exactly.
+
+    orjson happily encodes UUIDs, tuples, enums, dataclasses and subclasses of str/int,
+    and writes NaN as null, but none of those come back as the same type or value, so
+    only exact dict/list/str/int/float/bool/None trees with string keys qualify.
+    """
+    kind = type(value)
+    if kind is dict:
+        return all(type(key) is str and _is_plain_json(item) for key, item in value.items())
+    if kind is list:
+        return all(_is_plain_json(item) for item in value)
+    if kind is float:
+        return math.isfinite(value)
+    return kind in _JSON_SCALAR_TYPES
+
+
+def _freeze(value: Any) -> Tuple[Optional[bytes], Any]:
+    """Snapshot ``value`` for storage as ``(encoded, fallback)``.
+
+    Nested payloads made only of plain JSON types are encoded once to orjson bytes so
+    each hit costs a single parse; other values keep a private deep copy in ``fallback``.
+    """
+    if _is_frozen(value):
+        return None, value
+    if isinstance(value, dict) and all(_is_frozen(item) for item in value.values()):
+        return None, dict(value)
+    if orjson is not None and _is_plain_json(value):
+        try:
+            return orjson.dumps(value), None
+        except TypeError:  # orjson.JSONEncodeError subclasses TypeError (e.g. ints over 64 bits)
+            pass
+    return None, copy.deepcopy(value)
+
+
+def _thaw(encoded: Optional[bytes], fallback: Any) -> Any:
+    if encoded is not None:
+        return orjson.loads(encoded)
+    if _is_frozen(fallback):
+        return fallback
+    if isinstance(fallback, dict) and all(_is_frozen(item) for item in fallback.values()):
+        return dict(fallback)
+    return copy.deepcopy(fallback)
+
+
+class ToolResultCache:
+    """Bounded least-recently-used store for tool results keyed by ``make_cache_key``.
+
+    When ``ttl`` is given, entries older than that many seconds are treated as misses.
+    """
+
+    __slots__ = ("maxsize", "ttl", "_entries")
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[float, Optional[bytes], Any]]" = OrderedDict()
+
+    def get(self, key: int) -> Optional[Any]:
+        """Return a private copy of the cached result, or ``None`` on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, encoded, fallback = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return _thaw(encoded, fallback)
+
+    def set(self, key: int, value: Any) -> None:
+        """Store a snapshot of ``value``, evicting the oldest entry when full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (expires_at, *_freeze(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after a write that may have changed cached results."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _LeaderCancelled(Exception):
+    """Set on a flight whose leader was cancelled, telling waiters to retry the call."""
+
+
+class _Flight:
+    __slots__ = ("future", "waiters", "snapshot")
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.waiters = 0
+        self.snapshot: Optional[Tuple[Optional[bytes], Any]] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls that share a cache key into one execution.
+
+    The first caller runs ``factory``; callers arriving while it is in flight await
+    the same outcome and receive their own copy of the result. When anyone is
+    waiting, the result is snapshotted once before the first caller gets it back,
+    so each waiter only pays for a parse; if that snapshot fails, the waiters get
+    the error while the first caller keeps its result. If the first caller is
+    cancelled, the waiters are not: they retry, and the first of them runs
+    ``factory`` afresh.
+    """
+
+    __slots__ = ("_inflight",)
+
+    def __init__(self) -> None:
+        self._inflight: Dict[int, _Flight] = {}
+
+    async def do(self, key: int, factory: Callable[[], Awaitable[Any]]) -> Any:
+        while (flight := self._inflight.get(key)) is not None:
+            flight.waiters += 1
+            try:
+                await asyncio.shield(flight.future)
+            except _LeaderCancelled:
+                continue
+            return _thaw(*flight.snapshot)
+
+        future = asyncio.get_running_loop().create_future()
+        flight = self._inflight[key] = _Flight(future)
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            if flight.waiters:
+                try:
+                    flight.snapshot = _freeze(result)
+                except Exception as exc:
+                    # Waiters cannot get a copy, but must not be left blocked on the future
+                    future.set_exception(exc)
+                    future.exception()
+                    return result
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from app.core.tortoise_config import init_db, close_db
 from app.db.repository.competitor_price_repository import CompetitorPriceRepository
@@ -14,33 +14,13 @@ from app.db.repository.supplier_product_repository import SupplierProductReposit
 from app.db.repository.transaction_repository import TransactionRepository
 from app.db.repository.user_repository import UserRepository
 from app.tools.base import ToolBase
+from app.tools.cache import ToolResultCache, make_cache_key
 
 logger = logging.getLogger(__name__)
 
 
-class DatabaseAccessTool(ToolBase):
-    """Tool that provides access to database tables via repositories with full CRUD operations."""
-
-    def __init__(self) -> None:
-        self.repositories = {
-            "users": UserRepository,
-            "products": ProductRepository,
-            "supplier_products": SupplierProductRepository,
-            "competitor_prices": CompetitorPriceRepository,
-            "transactions": TransactionRepository,
-            "order_items": OrderItemRepository,
-            "flash_sales": FlashSaleRepository,
-        }
-
-        description = self._build_description()
-        super().__init__(
-            name="database_access",
-            description=description,
-        )
-
-    def _build_description(self) -> str:
-        """Build a comprehensive description of all tables and their attributes."""
-        return """
+# Static table catalogue shared by every tool instance; built once at import.
+DATABASE_TOOL_DESCRIPTION = """
 Access database tables using their respective repositories. Supports CRUD operations: create, get_by_id, update, delete, list, and table-specific methods.
 
 Available tables and their attributes:
@@ -126,6 +106,54 @@ Input format: {"table": "table_name", "method": "method_name", "args": [], "kwar
 Example: {"table": "users", "method": "list_users", "args": [], "kwargs": {"filters": {"role": "customer"}}}
 """
 
+
+REPOSITORIES: Dict[str, type] = {
+    "users": UserRepository,
+    "products": ProductRepository,
+    "supplier_products": SupplierProductRepository,
+    "competitor_prices": CompetitorPriceRepository,
+    "transactions": TransactionRepository,
+    "order_items": OrderItemRepository,
+    "flash_sales": FlashSaleRepository,
+}
+
+# (table, method) -> repository callable, resolved once so each call is a single dict lookup.
+_REPOSITORY_METHODS: Dict[Tuple[str, str], Callable[..., Any]] = {
+    (table, name): getattr(repo_class, name)
+    for table, repo_class in REPOSITORIES.items()
+    for name in dir(repo_class)
+    if not name.startswith("_") and callable(getattr(repo_class, name))
+}
+
+
+# Product catalogue reads repeat on almost every turn (name resolution runs several
+# queries plus a fuzzy scan) while the catalogue itself rarely changes.
+_CATALOG_READS = frozenset({
+    ("products", "find_product_by_any_name"),
+    ("products", "get_product_by_name"),
+    ("products", "get_product_by_id"),
+    ("products", "list_products"),
+})
+
+
+def _enum_value(member: Any) -> Any:
+    """Return the ``.value`` of an enum field, or None when it is unset."""
+    return member.value if member else None
+
+
+class DatabaseAccessTool(ToolBase):
+    """Tool that provides access to database tables via repositories with full CRUD operations."""
+
+    def __init__(self) -> None:
+        self.repositories = REPOSITORIES
+        # Serialised catalogue reads, kept across turns; cleared on any products write.
+        self._catalog_cache = ToolResultCache(maxsize=256, ttl=300)
+
+        super().__init__(
+            name="database_access",
+            description=DATABASE_TOOL_DESCRIPTION,
+        )
+
     async def run(self, input: Any, context: Optional[Dict[str, Any]] = None) -> Any:
         """Execute database operations via repositories.
 
@@ -145,38 +173,44 @@ Example: {"table": "users", "method": "list_users", "args": [], "kwargs": {"filt
 
         table = input.get("table")
         method = input.get("method")
-        args = input.get("args", [])
-        kwargs = input.get("kwargs", {})
+        args = input.get("args") or ()
+        kwargs = input.get("kwargs") or {}
         raw_instances = input.get("raw_instances", False)  # New parameter
 
         if not table or not method:
             raise ValueError("Input must include 'table' and 'method'")
 
-        if table not in self.repositories:
-            raise ValueError(f"Unknown table: {table}. Available tables: {list(self.repositories.keys())}")
-
-        repo_class = self.repositories[table]
-
-        if not hasattr(repo_class, method):
+        repo_method = _REPOSITORY_METHODS.get((table, method))
+        if repo_method is None:
+            if table not in self.repositories:
+                raise ValueError(f"Unknown table: {table}. Available tables: {list(self.repositories.keys())}")
             raise ValueError(f"Unknown method '{method}' for table '{table}'")
 
-        repo_method = getattr(repo_class, method)
+        cache_key = None
+        if (table, method) in _CATALOG_READS:
+            if not raw_instances:
+                try:
+                    cache_key = make_cache_key([method, list(args), kwargs])
+                except TypeError:
+                    cache_key = None
+                if cache_key is not None:
+                    cached = self._catalog_cache.get(cache_key)
+                    if cached is not None:
+                        return cached
+        elif table == "products":
+            self._catalog_cache.clear()
 
         try:
-            if args and kwargs:
-                result = await repo_method(*args, **kwargs)
-            elif args:
-                result = await repo_method(*args)
-            elif kwargs:
-                result = await repo_method(**kwargs)
-            else:
-                result = await repo_method()
+            result = await repo_method(*args, **kwargs)
 
             # Return raw instances if requested, otherwise serialize
             if raw_instances:
                 return result
             else:
-                return self._serialize_result(result)
+                serialized = self._serialize_result(result)
+                if cache_key is not None and serialized is not None:
+                    self._catalog_cache.set(cache_key, serialized)
+                return serialized
         except Exception as exc:
             logger.error("Database operation failed: %s", exc)
             raise ValueError(f"Database operation failed: {exc}") from exc
@@ -206,116 +240,137 @@ Example: {"table": "users", "method": "list_users", "args": [], "kwargs": {"filt
         if not hasattr(model, '_meta'):
             return model
 
+        # Known models (none define .dict()) dispatch on their type before the
+        # failing hasattr(model, 'dict') probe, which costs an AttributeError per row
+        # Serializers read fields directly, so a missing field raises instead of silently
+        # changing the shape of the row
+        serializer = _MODEL_SERIALIZERS.get(type(model).__name__)
+        if serializer is not None:
+            return serializer(self, model)
+
         # Use the model's built-in dict conversion if available
         if hasattr(model, 'dict'):
             return model.dict()
 
-        # Fallback: manually extract fields based on model type
+        # Generic fallback for other models - get all non-private attributes
         data = {}
-
-        # Get the model class name to handle specific fields
-        model_name = model.__class__.__name__
-
-        if model_name == 'User':
-            data = {
-                'user_id': getattr(model, 'user_id', None),
-                'name': getattr(model, 'name', None),
-                'phone': getattr(model, 'phone', None),
-                'default_location': getattr(model, 'default_location', None),
-                'preferred_language': getattr(model, 'preferred_language', None).value if getattr(model, 'preferred_language', None) else None,
-                'role': getattr(model, 'role', None).value if getattr(model, 'role', None) else None,
-                'joined_date': getattr(model, 'joined_date', None),
-                'created_at': getattr(model, 'created_at', None),
-            }
-        elif model_name == 'Product':
-            data = {
-                'product_id': str(getattr(model, 'product_id', None)),
-                'product_name_en': getattr(model, 'product_name_en', None),
-                'product_name_am': getattr(model, 'product_name_am', None),
-                'product_name_am_latin': getattr(model, 'product_name_am_latin', None),
-                'category': getattr(model, 'category', None).value if getattr(model, 'category', None) else None,
-                'unit': getattr(model, 'unit', None).value if getattr(model, 'unit', None) else None,
-                'base_price_etb': getattr(model, 'base_price_etb', None),
-                'in_season_start': getattr(model, 'in_season_start', None).value if getattr(model, 'in_season_start', None) else None,
-                'in_season_end': getattr(model, 'in_season_end', None).value if getattr(model, 'in_season_end', None) else None,
-                'image_url': getattr(model, 'image_url', None),
-                'created_at': getattr(model, 'created_at', None),
-            }
-        elif model_name == 'SupplierProduct':
-            supplier = getattr(model, 'supplier', None)
-            product = getattr(model, 'product', None)
-            data = {
-                'inventory_id': str(getattr(model, 'inventory_id', None)),
-                'supplier': self._model_to_dict(supplier) if supplier else None,
-                'product': self._model_to_dict(product) if product else None,
-                'quantity_available': getattr(model, 'quantity_available', None),
-                'unit': getattr(model, 'unit', None).value if getattr(model, 'unit', None) else None,
-                'unit_price_etb': getattr(model, 'unit_price_etb', None),
-                'expiry_date': getattr(model, 'expiry_date', None),
-                'available_delivery_days': getattr(model, 'available_delivery_days', None),
-                'last_updated': getattr(model, 'last_updated', None),
-                'status': getattr(model, 'status', None).value if getattr(model, 'status', None) else None,
-            }
-        elif model_name == 'Transaction':
-            user = getattr(model, 'user', None)
-            data = {
-                'order_id': str(getattr(model, 'order_id', None)),
-                'user': self._model_to_dict(user) if user else None,
-                'date': getattr(model, 'date', None),
-                'delivery_date': getattr(model, 'delivery_date', None),
-                'total_price': getattr(model, 'total_price', None),
-                'payment_method': getattr(model, 'payment_method', None).value if getattr(model, 'payment_method', None) else None,
-                'status': getattr(model, 'status', None).value if getattr(model, 'status', None) else None,
-                'created_at': getattr(model, 'created_at', None),
-            }
-        elif model_name == 'OrderItem':
-            order = getattr(model, 'order', None)
-            product = getattr(model, 'product', None)
-            supplier = getattr(model, 'supplier', None)
-            data = {
-                'id': str(getattr(model, 'id', None)),
-                'order': self._model_to_dict(order) if order else None,
-                'product': self._model_to_dict(product) if product else None,
-                'supplier': self._model_to_dict(supplier) if supplier else None,
-                'quantity': getattr(model, 'quantity', None),
-                'unit': getattr(model, 'unit', None).value if getattr(model, 'unit', None) else None,
-                'price_per_unit': getattr(model, 'price_per_unit', None),
-                'subtotal': getattr(model, 'subtotal', None),
-            }
-        elif model_name == 'CompetitorPrice':
-            product = getattr(model, 'product', None)
-            data = {
-                'id': str(getattr(model, 'id', None)),
-                'product': self._model_to_dict(product) if product else None,
-                'tier': getattr(model, 'tier', None).value if getattr(model, 'tier', None) else None,
-                'date': getattr(model, 'date', None),
-                'price_etb_per_kg': getattr(model, 'price_etb_per_kg', None),
-                'source_location': getattr(model, 'source_location', None),
-                'created_at': getattr(model, 'created_at', None),
-            }
-        elif model_name == 'FlashSale':
-            supplier_product = getattr(model, 'supplier_product', None)
-            supplier = getattr(model, 'supplier', None)
-            product = getattr(model, 'product', None)
-            data = {
-                'id': getattr(model, 'id', None),
-                'supplier_product': self._model_to_dict(supplier_product) if supplier_product else None,
-                'supplier': self._model_to_dict(supplier) if supplier else None,
-                'product': self._model_to_dict(product) if product else None,
-                'start_date': getattr(model, 'start_date', None),
-                'end_date': getattr(model, 'end_date', None),
-                'discount_percent': getattr(model, 'discount_percent', None),
-                'status': getattr(model, 'status', None).value if getattr(model, 'status', None) else None,
-                'auto_generated': getattr(model, 'auto_generated', None),
-                'created_at': getattr(model, 'created_at', None),
-                'updated_at': getattr(model, 'updated_at', None),
-            }
-        else:
-            # Generic fallback for other models - get all non-private attributes
-            for attr in dir(model):
-                if not attr.startswith('_') and not callable(getattr(model, attr)):
-                    value = getattr(model, attr)
-                    if not hasattr(value, '_meta'):  # Skip related models for now
-                        data[attr] = value
+        for attr in dir(model):
+            if not attr.startswith('_') and not callable(getattr(model, attr)):
+                value = getattr(model, attr)
+                if not hasattr(value, '_meta'):  # Skip related models for now
+                    data[attr] = value
 
         return data
+
+    def _user_to_dict(self, model) -> Dict[str, Any]:
+        return {
+            'user_id': model.user_id,
+            'name': model.name,
+            'phone': model.phone,
+            'default_location': model.default_location,
+            'preferred_language': _enum_value(model.preferred_language),
+            'role': _enum_value(model.role),
+            'joined_date': model.joined_date,
+            'created_at': model.created_at,
+        }
+
+    def _product_to_dict(self, model) -> Dict[str, Any]:
+        return {
+            'product_id': str(model.product_id),
+            'product_name_en': model.product_name_en,
+            'product_name_am': model.product_name_am,
+            'product_name_am_latin': model.product_name_am_latin,
+            'category': _enum_value(model.category),
+            'unit': _enum_value(model.unit),
+            'base_price_etb': model.base_price_etb,
+            'in_season_start': _enum_value(model.in_season_start),
+            'in_season_end': _enum_value(model.in_season_end),
+            'image_url': model.image_url,
+            'created_at': model.created_at,
+        }
+
+    def _supplier_product_to_dict(self, model) -> Dict[str, Any]:
+        supplier = model.supplier
+        product = model.product
+        return {
+            'inventory_id': str(model.inventory_id),
+            'supplier': self._model_to_dict(supplier) if supplier else None,
+            'product': self._model_to_dict(product) if product else None,
+            'quantity_available': model.quantity_available,
+            'unit': _enum_value(model.unit),
+            'unit_price_etb': model.unit_price_etb,
+            'expiry_date': model.expiry_date,
+            'available_delivery_days': model.available_delivery_days,
+            'last_updated': model.last_updated,
+            'status': _enum_value(model.status),
+        }
+
+    def _transaction_to_dict(self, model) -> Dict[str, Any]:
+        user = model.user
+        return {
+            'order_id': str(model.order_id),
+            'user': self._model_to_dict(user) if user else None,
+            'date': model.date,
+            'delivery_date': model.delivery_date,
+            'total_price': model.total_price,
+            'payment_method': _enum_value(model.payment_method),
+            'status': _enum_value(model.status),
+            'created_at': model.created_at,
+        }
+
+    def _order_item_to_dict(self, model) -> Dict[str, Any]:
+        order = model.order
+        product = model.product
+        supplier = model.supplier
+        return {
+            'id': str(model.id),
+            'order': self._model_to_dict(order) if order else None,
+            'product': self._model_to_dict(product) if product else None,
+            'supplier': self._model_to_dict(supplier) if supplier else None,
+            'quantity': model.quantity,
+            'unit': _enum_value(model.unit),
+            'price_per_unit': model.price_per_unit,
+            'subtotal': model.subtotal,
+        }
+
+    def _competitor_price_to_dict(self, model) -> Dict[str, Any]:
+        product = model.product
+        return {
+            'id': str(model.id),
+            'product': self._model_to_dict(product) if product else None,
+            'tier': _enum_value(model.tier),
+            'date': model.date,
+            'price_etb_per_kg': model.price_etb_per_kg,
+            'source_location': model.source_location,
+            'created_at': model.created_at,
+        }
+
+    def _flash_sale_to_dict(self, model) -> Dict[str, Any]:
+        supplier_product = model.supplier_product
+        supplier = model.supplier
+        product = model.product
+        return {
+            'id': model.id,
+            'supplier_product': self._model_to_dict(supplier_product) if supplier_product else None,
+            'supplier': self._model_to_dict(supplier) if supplier else None,
+            'product': self._model_to_dict(product) if product else None,
+            'start_date': model.start_date,
+            'end_date': model.end_date,
+            'discount_percent': model.discount_percent,
+            'status': _enum_value(model.status),
+            'auto_generated': model.auto_generated,
+            'created_at': model.created_at,
+            'updated_at': model.updated_at,
+        }
+
+
+# Model class name -> serializer, so each row costs one dict lookup instead of an elif chain.
+_MODEL_SERIALIZERS: Dict[str, Callable[[DatabaseAccessTool, Any], Dict[str, Any]]] = {
+    "User": DatabaseAccessTool._user_to_dict,
+    "Product": DatabaseAccessTool._product_to_dict,
+    "SupplierProduct": DatabaseAccessTool._supplier_product_to_dict,
+    "Transaction": DatabaseAccessTool._transaction_to_dict,
+    "OrderItem": DatabaseAccessTool._order_item_to_dict,
+    "CompetitorPrice": DatabaseAccessTool._competitor_price_to_dict,
+    "FlashSale": DatabaseAccessTool._flash_sale_to_dict,
+}
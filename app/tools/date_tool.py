@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import datetime
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -12,6 +13,35 @@ from app.tools.base import ToolBase
 
 logger = logging.getLogger(__name__)
 
+DATE_RESOLUTION_PROMPT_HEAD = """\
+Today is {today_iso} ({today_long}).
+
+Resolve the following natural language date expression to an exact date in YYYY-MM-DD format.
+If it's relative to today, calculate accordingly.
+If it's ambiguous, make a reasonable assumption based on current context.
+
+"""
+DATE_RESOLUTION_PROMPT_TAIL = """
+
+Return only the date in YYYY-MM-DD format, nothing else."""
+
+# Relative expressions resolved locally (lowered text -> day offset from today).
+_RELATIVE_DAY_OFFSETS = {
+    "today": 0,
+    "now": 0,
+    "tomorrow": 1,
+    "yesterday": -1,
+}
+
+
+@lru_cache(maxsize=4)
+def _date_prompt_head(today: datetime.date) -> str:
+    """Render the date-dependent part of the prompt once per day."""
+    return DATE_RESOLUTION_PROMPT_HEAD.format(
+        today_iso=today.isoformat(),
+        today_long=today.strftime('%A, %B %d, %Y'),
+    )
+
 
 class DateResolverTool(ToolBase):
     """Tool that resolves natural language dates to datetime.date objects."""
@@ -53,32 +83,27 @@ class DateResolverTool(ToolBase):
         today = datetime.date.today()
 
         # For simple cases, handle directly
-        date_text_lower = date_text.lower()
-        if date_text_lower in ["today", "now"]:
-            return today
-        elif date_text_lower == "tomorrow":
-            return today + datetime.timedelta(days=1)
-        elif date_text_lower == "yesterday":
-            return today - datetime.timedelta(days=1)
-
-        # For more complex cases, use LLM
-        from app.services.llm_service import LLMService
-        llm = self._llm_service or LLMService()
-        prompt = f"""
-            Today is {today.strftime('%Y-%m-%d')} ({today.strftime('%A, %B %d, %Y')}).
-
-            Resolve the following natural language date expression to an exact date in YYYY-MM-DD format.
-            If it's relative to today, calculate accordingly.
-            If it's ambiguous, make a reasonable assumption based on current context.
-
-            Expression: "{date_text}"
-
-            Return only the date in YYYY-MM-DD format, nothing else.
-        """
+        offset = _RELATIVE_DAY_OFFSETS.get(date_text.lower())
+        if offset is not None:
+            return today + datetime.timedelta(days=offset)
+
+        # For more complex cases, use LLM; a fallback service is built on first use and kept,
+        # since the system prompt is passed per call and the service holds no per-request state
+        llm = self._llm_service
+        if llm is None:
+            from app.services.llm_service import LLMService
+            llm = self._llm_service = LLMService()
+        prompt = f'{_date_prompt_head(today)}Expression: "{date_text}"{DATE_RESOLUTION_PROMPT_TAIL}'
 
         try:
-            response = await llm.acomplete(prompt)
+            # The answer is a single line; stop there rather than paying for any trailing commentary.
+            # The prompt is self-contained, so skip the shared service's assistant persona for this call.
+            response = await llm.acomplete(prompt, system_prompt="", stop=["\n"])
             resolved_date_str = response.strip()
+            if not resolved_date_str:
+                # A reply that opens with a newline is cut off before the date; ask again unbounded
+                response = await llm.acomplete(prompt, system_prompt="")
+                resolved_date_str = response.strip().partition("\n")[0].strip()
             # Validate the format
             resolved_date = datetime.datetime.strptime(resolved_date_str, "%Y-%m-%d").date()
             return resolved_date
@@ -1,9 +1,14 @@
+import asyncio
+import os
+import re
 from google import genai
 from PIL import Image
 from io import BytesIO
 from app.core.config import get_settings
 from app.tools.base import ToolBase
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^a-zA-Z0-9_-]')
 
 
 class ImageGeneratorTool(ToolBase):
@@ -24,31 +29,32 @@ class ImageGeneratorTool(ToolBase):
 			f"The {subject} should be shown as packed and fresh on the package add a tag KCartBot in bold and powered by ChipChip"
 		)
 
-		response = client.models.generate_content(
+		response = await client.aio.models.generate_content(
 			model="gemini-2.5-flash-image",
 			contents=[prompt],
 		)
 
-		import os
-		import re
+		# Decoding and writing the PNG is blocking work; keep it off the event loop
+		saved, image_path = await asyncio.to_thread(self._save_first_image, response, subject)
+
+		if saved:
+			return f"Image generated and saved: {image_path}"
+		else:
+			return "No image was generated."
+
+	@staticmethod
+	def _save_first_image(response: Any, subject: str) -> Tuple[bool, str]:
 		image_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'images')
 		os.makedirs(image_dir, exist_ok=True)
 		# Sanitize subject for filename
-		safe_subject = re.sub(r'[^a-zA-Z0-9_-]', '_', subject.strip())
+		safe_subject = _UNSAFE_FILENAME_CHARS.sub('_', subject.strip())
 		image_path = os.path.join(image_dir, f"{safe_subject}.png")
 		# Delete existing image if present
 		if os.path.exists(image_path):
 			os.remove(image_path)
-		saved = False
 		for part in response.candidates[0].content.parts:
 			if part.inline_data is not None:
 				image = Image.open(BytesIO(part.inline_data.data))
 				image.save(image_path)
-				saved = True
-				break  # Only save the first image
-
-		if saved:
-			return f"Image generated and saved: {image_path}"
-		else:
-			return "No image was generated."
-
+				return True, image_path  # Only save the first image
+		return False, image_path
@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import logging
-import re
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Literal
 
 from app.tools.base import ToolBase
+from app.tools.cache import ToolResultCache, make_cache_key
+from app.utils import json_utils
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
 logger = logging.getLogger(__name__)
@@ -343,7 +343,21 @@ Return a compact JSON object with the following keys:
 If no intent reasonably matches AND there's no context to understand a confirmation, set intent to "intent.unknown" and flow to "unknown" with confidence under 0.4.
 
 Always respond with JSON only. Avoid markdown fences or commentary.
-"""
+""".strip()
+
+UNKNOWN_INTENT = "intent.unknown"
+
+
+def _unknown_result(rationale: str) -> Dict[str, Any]:
+    """Build the fallback classification returned whenever no intent can be resolved."""
+    return {
+        "intent": UNKNOWN_INTENT,
+        "flow": "unknown",
+        "confidence": 0.0,
+        "filled_slots": {},
+        "missing_slots": [],
+        "rationale": rationale,
+    }
 
 
 class IntentClassifierTool(ToolBase):
@@ -361,13 +375,16 @@ class IntentClassifierTool(ToolBase):
                 "Call this before any other tool to decide the correct flow and required slots."
             ),
         )
-        prompt = system_prompt or CLASSIFIER_SYSTEM_PROMPT
+        # Sent per call so a shared LLM service keeps its own system prompt. Stored
+        # pre-stripped so the per-request strip in LLMService returns it without copying.
+        self._system_prompt = (system_prompt or CLASSIFIER_SYSTEM_PROMPT).strip()
         if llm_service:
             self._llm = llm_service
-            self._llm.update_system_prompt(prompt)
         else:
             from app.services.llm_service import LLMService
-            self._llm = LLMService(system_prompt=prompt)
+            self._llm = LLMService(system_prompt=self._system_prompt)
+        # Identical utterance + history + session context recur across turns and retries.
+        self._result_cache = ToolResultCache(maxsize=64, ttl=300)
 
     async def run(self, input: Any, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Classify the provided text and return structured metadata."""
@@ -377,39 +394,25 @@ class IntentClassifierTool(ToolBase):
             utterance = str(input or "")
 
         if not utterance.strip():
-            return {
-                "intent": "intent.unknown",
-                "flow": "unknown",
-                "confidence": 0.0,
-                "filled_slots": {},
-                "missing_slots": [],
-                "rationale": "No user utterance provided.",
-            }
+            return _unknown_result("No user utterance provided.")
 
         # Extract chat history from context for better classification
         chat_history = []
         if context and "chat_history" in context:
             chat_history = context["chat_history"]
-            # Keep only last 3 exchanges to avoid token overflow
-            if len(chat_history) > 6:
-                chat_history = chat_history[-6:]
-
-        # Format history for the classifier
-        history_text = ""
-        if chat_history:
-            history_text = "Recent conversation:\n"
-            for msg in chat_history:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                history_text += f"{role}: {content}\n"
+
+        # Format the last 3 exchanges in a single pass
+        history_text = self._serialise_history(chat_history, start=max(len(chat_history) - 6, 0))
 
         extra_context = ""
-        if context:
+        # The agent usually passes only chat_history; read the context by reference and
+        # build the filtered copy only when there is something besides the history
+        if context and any(key != "chat_history" for key in context):
             # Filter out chat_history from extra context to avoid duplication
             filtered_context = {k: v for k, v in context.items() if k != "chat_history"}
             if filtered_context:
                 try:
-                    extra_context = json.dumps(filtered_context, ensure_ascii=False)
+                    extra_context = json_utils.dumps(filtered_context)
                 except Exception:
                     extra_context = str(filtered_context)
 
@@ -420,72 +423,54 @@ class IntentClassifierTool(ToolBase):
             "Respond with JSON only."
         )
 
+        cache_key = make_cache_key(prompt)
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            response = await self._llm.acomplete(prompt)
-            return self._parse_response(response)
+            response = await self._llm.acomplete(prompt, system_prompt=self._system_prompt)
+            result = self._parse_response(response)
         except Exception as exc:  # pragma: no cover - defensive logging
             logger.error("Intent classification failed: %s", exc)
-            return {
-                "intent": "intent.unknown",
-                "flow": "unknown",
-                "confidence": 0.0,
-                "filled_slots": {},
-                "missing_slots": [],
-                "rationale": "LLM classification error.",
-            }
+            return _unknown_result("LLM classification error.")
+        if result["intent"] != UNKNOWN_INTENT:
+            self._result_cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    def _serialise_history(chat_history: List[Dict[str, Any]], start: int = 0) -> str:
+        """Render chat turns from index ``start`` as ``role: content`` lines for the prompt."""
+        if start >= len(chat_history):
+            return ""
+        lines = [
+            f"{msg.get('role', 'user')}: {msg.get('content', '')}\n"
+            for msg in chat_history[start:]
+        ]
+        return "Recent conversation:\n" + "".join(lines)
 
     @staticmethod
     def _parse_response(raw_text: str) -> Dict[str, Any]:
         """Parse JSON content from the LLM response."""
         if not raw_text:
-            return {
-                "intent": "intent.unknown",
-                "flow": "unknown",
-                "confidence": 0.0,
-                "filled_slots": {},
-                "missing_slots": [],
-                "rationale": "Empty response from classifier.",
-            }
+            return _unknown_result("Empty response from classifier.")
 
         json_text = IntentClassifierTool._extract_json(raw_text)
         if not json_text:
             logger.warning("Classifier returned non-JSON payload: %s", raw_text)
-            return {
-                "intent": "intent.unknown",
-                "flow": "unknown",
-                "confidence": 0.0,
-                "filled_slots": {},
-                "missing_slots": [],
-                "rationale": "Classifier response was not valid JSON.",
-            }
+            return _unknown_result("Classifier response was not valid JSON.")
 
+        # pydantic-core parses and validates in one pass without an intermediate dict
         try:
-            raw_payload = json.loads(json_text)
-        except json.JSONDecodeError:
-            logger.warning("Failed to decode classifier JSON: %s", json_text)
-            return {
-                "intent": "intent.unknown",
-                "flow": "unknown",
-                "confidence": 0.0,
-                "filled_slots": {},
-                "missing_slots": [],
-                "rationale": "Classifier JSON parsing error.",
-            }
-
-        try:
-            payload = IntentClassifierPayload.model_validate(raw_payload)
+            payload = IntentClassifierPayload.model_validate_json(json_text)
         except ValidationError as exc:
+            if any(error["type"] == "json_invalid" for error in exc.errors()):
+                logger.warning("Failed to decode classifier JSON: %s", json_text)
+                return _unknown_result("Classifier JSON parsing error.")
             logger.warning("Invalid classifier payload: %s", exc)
-            return {
-                "intent": "intent.unknown",
-                "flow": "unknown",
-                "confidence": 0.0,
-                "filled_slots": {},
-                "missing_slots": [],
-                "rationale": "Classifier payload validation error.",
-            }
-
-        intent = payload.intent or "intent.unknown"
+            return _unknown_result("Classifier payload validation error.")
+
+        intent = payload.intent or UNKNOWN_INTENT
         definition = INTENT_REGISTRY.get(intent)
         filled_slots = payload.filled_slots or {}
         missing_slots = payload.missing_slots
@@ -510,6 +495,33 @@ class IntentClassifierTool(ToolBase):
 
     @staticmethod
     def _extract_json(text: str) -> Optional[str]:
-        """Extract the first JSON object from the text."""
-        match = re.search(r"\{.*\}", text, flags=re.DOTALL)
-        return match.group(0) if match else None
+        """Extract the first JSON object from the text.
+
+        Scans once from the first ``{``, tracking brace depth and string literals, so
+        trailing commentary after the object does not leak into the payload.
+        """
+        start = text.find("{")
+        if start == -1:
+            return None
+
+        depth = 0
+        in_string = False
+        escaped = False
+        for index in range(start, len(text)):
+            char = text[index]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == "{":
+                depth += 1
+            elif char == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:index + 1]
+        return None
@@ -6,6 +6,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from app.tools.base import ToolBase
+from app.utils import json_utils
 from app.utils.language_utils import LanguageDetector, TranslationService, MultilingualResponseFormatter, Language
 
 logger = logging.getLogger(__name__)
@@ -30,21 +31,14 @@ class MultilingualTestingTool(ToolBase):
         # Initialize language utilities
         self.language_detector = LanguageDetector()
 
-        if llm_service:
-            self._llm = llm_service
-            self.translation_service = TranslationService(llm_service)
-            self.response_formatter = MultilingualResponseFormatter(self.translation_service)
-        else:
-            from app.services.llm_service import LLMService
-            self._llm = LLMService()
-            self.translation_service = TranslationService(self._llm)
-            self.response_formatter = MultilingualResponseFormatter(self.translation_service)
-
+        # One LLM service shared by the validation prompts and the translation service
         if llm_service:
             self._llm = llm_service
         else:
             from app.services.llm_service import LLMService
             self._llm = LLMService()
+        self.translation_service = TranslationService(self._llm)
+        self.response_formatter = MultilingualResponseFormatter(self.translation_service)
 
     async def run(self, input: Any, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Run comprehensive multilingual testing."""
@@ -131,15 +125,19 @@ class MultilingualTestingTool(ToolBase):
             "Please provide your location"
         ])
 
+        # Successful entries are collected as they are produced rather than re-filtered later
         results = []
+        successful_translations = []
         for phrase in test_phrases:
             try:
                 translated = await self.translation_service.translate_to_amharic(phrase)
-                results.append({
+                result = {
                     "original": phrase,
                     "translated": translated,
                     "success": True
-                })
+                }
+                results.append(result)
+                successful_translations.append(result)
             except Exception as e:
                 results.append({
                     "original": phrase,
@@ -149,7 +147,6 @@ class MultilingualTestingTool(ToolBase):
                 })
 
         # Use LLM to evaluate translations
-        successful_translations = [r for r in results if r["success"]]
         validation_prompt = f"""
         Evaluate these English to Amharic translations:
 
@@ -182,7 +179,7 @@ class MultilingualTestingTool(ToolBase):
             "test_type": "translation",
             "results": results,
             "validation": validation,
-            "success_rate": len([r for r in results if r["success"]]) / len(results)
+            "success_rate": len(successful_translations) / len(results)
         }
 
     async def _test_response_formatting(self, input: Dict[str, Any]) -> Dict[str, Any]:
@@ -301,13 +298,12 @@ IMPORTANT: Respond ONLY with valid JSON. Do not include any conversational text,
         """Parse LLM validation response."""
         try:
             # Try to extract JSON from response
-            import json
             import re
 
             # Look for JSON in the response
             json_match = re.search(r'\{.*\}', llm_response, re.DOTALL)
             if json_match:
-                return json.loads(json_match.group(0))
+                return json_utils.loads(json_match.group(0))
             else:
                 return {"error": "No JSON found in LLM response", "raw_response": llm_response}
         except Exception as e:
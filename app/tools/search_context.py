@@ -2,13 +2,14 @@
 
 from typing import Any, Dict, List, Optional
 import asyncio
-import json
 import logging
 from datetime import datetime, timedelta
 
 from app.tools.base import ToolBase
+from app.tools.cache import SingleFlight, ToolResultCache, make_cache_key
 from app.db.milvus_handler import MilvusHandler
 from app.core.config import get_settings
+from app.utils import json_utils
 
 from google import genai
 
@@ -82,6 +83,10 @@ class VectorSearchTool(ToolBase):
         self._connected = False
         self._connection_failure: Optional[Dict[str, Any]] = None
         self._next_retry_at: Optional[datetime] = None
+
+        # The knowledge base is static, so identical searches can be answered from memory
+        self._result_cache = ToolResultCache(maxsize=256)
+        self._inflight = SingleFlight()
         
         logger.info(f"VectorSearchTool initialized with collection '{collection_name}'")
 
@@ -153,9 +158,11 @@ class VectorSearchTool(ToolBase):
         delta = self._next_retry_at - now
         return max(int(delta.total_seconds()), 0)
 
-    def _generate_query_embedding(self, query_text: str) -> List[float]:
+    async def _generate_query_embedding(self, query_text: str) -> List[float]:
         """
         Generate embedding vector for the query text.
+
+        Uses the async Gemini client so the request never blocks the event loop.
         
         Args:
             query_text: The search query
@@ -164,12 +171,12 @@ class VectorSearchTool(ToolBase):
             Embedding vector as a list of floats
         """
         try:
-            result = self.client.models.embed_content(
+            result = await self.client.aio.models.embed_content(
                 model=self.embedding_model,
                 contents=query_text,
             )
             embedding = result.embeddings[0].values
-            logger.debug(f"Generated embedding for query: {query_text[:50]}...")
+            logger.debug("Generated embedding for query: %.50s...", query_text)
             return embedding
         except Exception as e:
             logger.error(f"Failed to generate query embedding: {str(e)}")
@@ -297,6 +304,66 @@ class VectorSearchTool(ToolBase):
             logger.error(f"Vector search failed: {str(e)}")
             raise
 
+    async def _execute_search(
+        self,
+        cache_key: int,
+        query: str,
+        top_k: int,
+        min_score: Optional[float],
+        filters: Optional[str],
+        include_metadata: bool,
+        output_format: str,
+    ) -> Dict[str, Any]:
+        """Embed the query, search Milvus and cache the formatted response."""
+        # Ensure connection
+        await self._ensure_connection()
+
+        # Generate query embedding
+        logger.info("Processing search query: '%s'", query)
+        query_embedding = await self._generate_query_embedding(query)
+
+        # Perform vector search
+        search_results = await self._search_vectors(
+            query_embedding=query_embedding,
+            top_k=top_k,
+            min_score=min_score,
+            filters=filters,
+        )
+
+        # Format response based on requested format
+        if output_format == "text_only":
+            # Return just the text content for easy integration
+            response = {
+                "query": query,
+                "results": [r["text"] for r in search_results],
+                "count": len(search_results),
+            }
+            self._result_cache.set(cache_key, response)
+            return response
+
+        # Detailed format (default)
+        response = {
+            "query": query,
+            "results": search_results,
+            "count": len(search_results),
+        }
+
+        if include_metadata:
+            response["metadata"] = {
+                "collection": self.collection_name,
+                "top_k": top_k,
+                "min_score": min_score,
+                "filters": filters,
+                "embedding_model": self.embedding_model,
+            }
+
+        # Add a helpful context summary for the AI agent
+        if search_results:
+            response["context_summary"] = self._create_context_summary(search_results)
+
+        self._result_cache.set(cache_key, response)
+        return response
+
     async def run(self, input: Any, context: Dict[str, Any] = None) -> Any:
         """
         Execute vector search to retrieve relevant context.
@@ -324,8 +391,8 @@ class VectorSearchTool(ToolBase):
             # Parse input if it's a string
             if isinstance(input, str):
                 try:
-                    input = json.loads(input)
-                except json.JSONDecodeError:
+                    input = json_utils.loads(input)
+                except json_utils.JSONDecodeError:
                     # Treat as a simple query string
                     input = {"query": input}
             
@@ -350,52 +417,22 @@ class VectorSearchTool(ToolBase):
             if min_score is not None:
                 if not isinstance(min_score, (int, float)) or min_score < 0 or min_score > 1:
                     return {"error": "min_score must be a number between 0 and 1"}
-            
-            # Ensure connection
-            await self._ensure_connection()
-            
-            # Generate query embedding
-            logger.info(f"Processing search query: '{query}'")
-            query_embedding = self._generate_query_embedding(query)
-            
-            # Perform vector search
-            search_results = await self._search_vectors(
-                query_embedding=query_embedding,
-                top_k=top_k,
-                min_score=min_score,
-                filters=filters,
+
+            cache_key = make_cache_key(
+                [query, top_k, min_score, filters, include_metadata, output_format]
             )
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Vector search cache hit for query: '%s'", query)
+                return cached
             
-            # Format response based on requested format
-            if output_format == "text_only":
-                # Return just the text content for easy integration
-                return {
-                    "query": query,
-                    "results": [r["text"] for r in search_results],
-                    "count": len(search_results),
-                }
-            
-            # Detailed format (default)
-            response = {
-                "query": query,
-                "results": search_results,
-                "count": len(search_results),
-            }
-            
-            if include_metadata:
-                response["metadata"] = {
-                    "collection": self.collection_name,
-                    "top_k": top_k,
-                    "min_score": min_score,
-                    "filters": filters,
-                    "embedding_model": self.embedding_model,
-                }
-            
-            # Add a helpful context summary for the AI agent
-            if search_results:
-                response["context_summary"] = self._create_context_summary(search_results)
-            
-            return response
+            # Identical searches already in flight share a single execution
+            return await self._inflight.do(
+                cache_key,
+                lambda: self._execute_search(
+                    cache_key, query, top_k, min_score, filters, include_metadata, output_format
+                ),
+            )
         except VectorDBUnavailableError as exc:
             retry_after = exc.retry_after
             details: Dict[str, Any] = {
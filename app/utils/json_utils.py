@@ -0,0 +1,38 @@
+"""JSON helpers backed by orjson when available, falling back to the stdlib."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:  # pragma: no cover - exercised implicitly depending on the environment
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both.
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any, *, sort_keys: bool = False) -> str:
+    """Serialise ``obj`` to a JSON string, keeping non-ASCII characters intact."""
+    if orjson is not None:
+        return dumps_bytes(obj, sort_keys=sort_keys).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys)
+
+
+def dumps_bytes(obj: Any, *, sort_keys: bool = False) -> bytes:
+    """Serialise ``obj`` to UTF-8 JSON bytes, as orjson produces them, without a str round-trip."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Deserialise a JSON document from text or raw bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -21,6 +21,9 @@ class LanguageDetector:
     # Amharic Unicode range
     AMHARIC_RANGE = re.compile(r'[\u1200-\u137F\u1380-\u139F\u2D80-\u2DDF\uAB00-\uAB2F]')
 
+    # Word tokens used to spot phonetic Amharic
+    WORD_RE = re.compile(r'\b\w+\b')
+
     # Common Amharic words in Latin script (phonetic)
     AMHARIC_LATIN_WORDS = {
         'neger', 'yene', 'yemay', 'yemata', 'yemibal', 'yemibalew', 'yemibalewot',
@@ -42,17 +45,16 @@ class LanguageDetector:
         Returns:
             Detected language
         """
-        if not text or not text.strip():
+        text_lower = text.strip().lower() if text else ""
+        if not text_lower:
             return Language.ENGLISH  # Default fallback
 
-        text_lower = text.lower().strip()
-
         # Check for Amharic Unicode characters
         if LanguageDetector.AMHARIC_RANGE.search(text):
             return Language.AMHARIC
 
         # Check for phonetic Amharic (Latin script)
-        words = set(re.findall(r'\b\w+\b', text_lower))
+        words = set(LanguageDetector.WORD_RE.findall(text_lower))
         amharic_latin_matches = words.intersection(LanguageDetector.AMHARIC_LATIN_WORDS)
 
         # If we have multiple Amharic-like words, it's likely phonetic Amharic
@@ -100,9 +102,14 @@ class TranslationService:
         "I encountered an issue processing your request. Please try again.": "ጥያቄህን ለማስተካከል ችግር ተለመደልኝ። እባክህ እንደገና ሞክር።",
     }
 
+    # Upper bound on remembered LLM translations; the oldest entry is dropped first.
+    MAX_CACHED_TRANSLATIONS = 256
+
     def __init__(self, llm_service):
         """Initialize translation service with LLM service for dynamic translations."""
         self.llm_service = llm_service
+        # Response texts repeat across turns, so keep each LLM translation once made.
+        self._translation_cache: Dict[str, str] = {}
 
     async def translate_to_amharic(self, text: str) -> str:
         """
@@ -118,6 +125,10 @@ class TranslationService:
         if text in self.AMHARIC_TRANSLATIONS:
             return self.AMHARIC_TRANSLATIONS[text]
 
+        cached = self._translation_cache.get(text)
+        if cached is not None:
+            return cached
+
         # Use LLM for dynamic translation
         try:
             prompt = f"""
@@ -128,7 +139,13 @@ English: {text}
 Amharic:"""
 
             translation = await self.llm_service.acomplete(prompt)
-            return translation.strip() if translation else text
+            if not translation:
+                return text
+            translation = translation.strip()
+            if len(self._translation_cache) >= self.MAX_CACHED_TRANSLATIONS:
+                del self._translation_cache[next(iter(self._translation_cache))]
+            self._translation_cache[text] = translation
+            return translation
 
         except Exception as exc:
             logger.error(f"Failed to translate text: {exc}")
@@ -2,7 +2,14 @@
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from app.agents.agent import Agent
+from app.agents.agent import (
+    Agent,
+    _ADVISORY_RAG_PROMPT,
+    _IN_SEASON_RAG_PROMPT,
+    _NUTRITION_RAG_PROMPT,
+    _SEASONAL_RAG_PROMPT,
+    _STORAGE_RAG_PROMPT,
+)
 
 
 class TestAgent:
@@ -299,7 +306,7 @@ class TestAgent:
         # Make intent classifier raise an exception
         mock_intent_classifier.run.side_effect = Exception("Test error")
 
-        result = await agent.process_message("Hello")
+        result = await agent.process_message("I need some vegetables")
 
         assert "response" in result
         assert "error" in result
@@ -358,6 +365,8 @@ class TestAgent:
         assert "Hello! Welcome to KCartBot" in result["response"]
         assert "customer looking to place an order" in result["response"]
         assert "supplier managing inventory" in result["response"]
+        # Bare greetings are answered without an LLM classification round-trip
+        mock_intent_classifier.run.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_customer_place_order_flow(self, agent, mock_intent_classifier, mock_database_tool):
@@ -585,4 +594,201 @@ class TestAgent:
             result = await agent.process_message("Remove butter from my inventory", session_context)
 
         assert "response" in result
-        assert "Removed butter from your inventory" in result["response"]
\ No newline at end of file
+        assert "Removed butter from your inventory" in result["response"]
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_all_tools(self, agent, mock_vector_search, mock_database_tool):
+        """Test that closing the agent closes every tool even if one fails."""
+        mock_vector_search.aclose.side_effect = RuntimeError("milvus gone")
+
+        await agent.aclose()
+
+        mock_vector_search.aclose.assert_awaited_once()
+        mock_database_tool.aclose.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_rag_answer_overrides_system_prompt_per_call(self, agent, mock_intent_classifier, mock_llm_service):
+        """Test that RAG answers pass a per-call system prompt instead of cloning the service."""
+        mock_intent_classifier.run.return_value = {
+            "intent": "intent.customer.storage_advice",
+            "flow": "customer",
+            "filled_slots": {"product_name": "apples"},
+            "missing_slots": [],
+            "suggested_tools": []
+        }
+        mock_llm_service.acomplete = AsyncMock(return_value="Keep apples in a cool, dry place.")
+
+        result = await agent.process_message("How should I store apples?")
+
+        assert result["response"] == "Keep apples in a cool, dry place."
+        assert mock_llm_service.acomplete.await_args.kwargs["system_prompt"] == _STORAGE_RAG_PROMPT
+        mock_llm_service.clone.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_process_messages_keeps_sessions_isolated(self, agent):
+        """Test batch processing returns ordered results with separate session contexts."""
+        first_context = {"user_id": 1}
+        second_context = {"user_id": 2}
+
+        results = await agent.process_messages(
+            [("hello", first_context), ("selam", second_context)],
+            max_concurrency=2,
+        )
+
+        assert len(results) == 2
+        assert results[0]["session_context"] is first_context
+        assert results[1]["session_context"] is second_context
+        assert first_context["chat_history"][0]["content"] == "hello"
+        assert second_context["chat_history"][0]["content"] == "selam"
+
+    @pytest.mark.asyncio
+    async def test_nutrition_query_batches_product_lookups(self, agent, mock_intent_classifier, mock_database_tool, mock_vector_search):
+        """Test both product lookups run as one batch and a failed lookup keeps the user's name."""
+        mock_intent_classifier.run.return_value = {
+            "intent": "intent.customer.nutrition_query",
+            "flow": "customer",
+            "filled_slots": {"product_a": "ቲማቲም", "product_b": "kale"},
+            "missing_slots": [],
+            "suggested_tools": []
+        }
+        mock_database_tool.run.side_effect = [
+            {"product_name_en": "Tomato"},
+            Exception("lookup failed"),
+        ]
+        mock_vector_search.run.return_value = {"results": []}
+
+        await agent.process_message("Compare tomato and kale")
+
+        assert mock_database_tool.run.await_count == 2
+        query = mock_vector_search.run.await_args.args[0]["query"]
+        assert query == "nutritional comparison between Tomato and kale"
+
+    @pytest.mark.asyncio
+    async def test_customer_deliveries_loads_order_items_once(self, agent, mock_intent_classifier, mock_database_tool):
+        """Test customer deliveries fetch order items for all orders in a single query."""
+        mock_intent_classifier.run.return_value = {
+            "intent": "intent.customer.check_deliveries",
+            "flow": "customer",
+            "filled_slots": {},
+            "missing_slots": [],
+            "suggested_tools": []
+        }
+        mock_database_tool.run.side_effect = [
+            [
+                {"order_id": "aaaaaaaa-1", "status": "Pending", "total_price": 100},
+                {"order_id": "bbbbbbbb-2", "status": "Delivered", "total_price": 50},
+            ],
+            [
+                {"order": {"order_id": "aaaaaaaa-1"}, "product": {"product_name_en": "Tomato"}},
+                {"order": {"order_id": "bbbbbbbb-2"}, "product": {"product_name_en": "Onion"}},
+                {"order": {"order_id": "aaaaaaaa-1"}, "product": {"product_name_en": "Mango"}},
+            ],
+        ]
+
+        result = await agent.process_message("Where are my orders?", {"user_id": 1})
+
+        assert mock_database_tool.run.await_count == 2
+        items_query = mock_database_tool.run.await_args_list[1].args[0]
+        assert items_query["kwargs"]["filters"]["order_id"]["value"] == ["aaaaaaaa-1", "bbbbbbbb-2"]
+        assert "Tomato, Mango" in result["response"]
+        assert "Onion" in result["response"]
+
+    @pytest.mark.asyncio
+    async def test_order_product_names_filter_runs_against_repository(self, agent):
+        """Test the batched order-item filter is accepted by the real repository query."""
+        import datetime
+
+        from tortoise import Tortoise
+
+        from app.db.models import OrderItem, Product, Transaction, User
+        from app.tools.database_tool import DatabaseAccessTool
+
+        await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["app.db.models"]})
+        try:
+            await Tortoise.generate_schemas()
+            customer = await User.create(
+                name="Abebe", phone="0911000000", default_location="Bole",
+                preferred_language="English", role="customer", joined_date=datetime.date.today(),
+            )
+            tomato, onion = [
+                await Product.create(
+                    product_name_en=name, product_name_am=name, product_name_am_latin=name,
+                    category="Vegetable", unit="kg", base_price_etb=20.0,
+                    in_season_start="January", in_season_end="December",
+                )
+                for name in ("Tomato", "Onion")
+            ]
+            orders = [
+                await Transaction.create(
+                    user=customer, date=datetime.date.today(), total_price=40.0,
+                    payment_method="COD", status="Pending",
+                )
+                for _ in range(3)
+            ]
+            for order, product in ((orders[0], tomato), (orders[0], onion), (orders[1], onion), (orders[2], tomato)):
+                await OrderItem.create(
+                    order=order, product=product, quantity=1.0, unit="kg",
+                    price_per_unit=20.0, subtotal=20.0,
+                )
+
+            agent.database_tool = DatabaseAccessTool()
+            names = await agent._index_order_product_names(
+                [{"order_id": str(orders[0].order_id)}, {"order_id": str(orders[1].order_id)}]
+            )
+        finally:
+            await Tortoise.close_connections()
+
+        assert sorted(names[str(orders[0].order_id)]) == ["Onion", "Tomato"]
+        assert names[str(orders[1].order_id)] == ["Onion"]
+        assert str(orders[2].order_id) not in names
+
+    @pytest.mark.asyncio
+    async def test_role_answer_skips_classifier(self, agent, mock_intent_classifier):
+        """Test a plain role answer is routed to onboarding without an LLM classification."""
+        result = await agent.process_message("I'm a supplier!")
+
+        mock_intent_classifier.run.assert_not_called()
+        assert result["intent_info"]["intent"] == "intent.user.is_supplier"
+        assert result["session_context"]["user_role"] == "supplier"
+
+    @pytest.mark.asyncio
+    async def test_confirmation_matches_whole_words(self, agent, mock_intent_classifier):
+        """Test confirmations are detected as words, not substrings, and skip the classifier without history."""
+        history = [
+            {"role": "user", "content": "I want to sell"},
+            {"role": "assistant", "content": "Shall I register you as a supplier?"},
+        ]
+        mock_intent_classifier.run.return_value = {
+            "intent": "intent.unknown",
+            "flow": "unknown",
+            "filled_slots": {},
+            "missing_slots": [],
+            "suggested_tools": []
+        }
+
+        money = await agent.process_message("money", {"chat_history": list(history)})
+        confirmed = await agent.process_message("Yes, go ahead", {"chat_history": list(history)})
+        assert money["response"] != confirmed["response"]
+        assert mock_intent_classifier.run.await_count == 2
+
+        await agent.process_message("okay!")
+        assert mock_intent_classifier.run.await_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("intent, slots, system_prompt", [
+        ("intent.customer.storage_advice", {"product_name": "apples"}, _STORAGE_RAG_PROMPT),
+        ("intent.customer.nutrition_query", {"product_a": "apples", "product_b": "bananas"}, _NUTRITION_RAG_PROMPT),
+        ("intent.customer.seasonal_query", {"product_name": "mangoes"}, _SEASONAL_RAG_PROMPT),
+        ("intent.customer.what_is_in_season", {}, _IN_SEASON_RAG_PROMPT),
+        ("intent.customer.general_advisory", {"question": "Are avocados ripe when soft?"}, _ADVISORY_RAG_PROMPT),
+    ], ids=["storage", "nutrition", "seasonal", "in_season", "advisory"])
+    async def test_rag_answers_always_send_a_system_prompt(self, agent, mock_llm_service, intent, slots, system_prompt):
+        """Test that no RAG answer is requested without a system message."""
+        mock_llm_service.acomplete = AsyncMock(return_value="Answer from context.")
+
+        result = await agent._customer_handlers[intent](slots, {"detected_language": "english"})
+
+        assert result == "Answer from context."
+        sent_prompt = mock_llm_service.acomplete.await_args.kwargs["system_prompt"]
+        assert sent_prompt and sent_prompt == system_prompt
+
@@ -0,0 +1,54 @@
+"""Tests for the chat service session handling."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from app.services.chat_service import ChatService
+
+
+class TestChatService:
+    """Test cases for per-session turn handling."""
+
+    @pytest.fixture
+    def service(self):
+        """Create a chat service with a stubbed agent."""
+        with patch('app.services.chat_service.Agent'):
+            return ChatService()
+
+    @pytest.mark.asyncio
+    async def test_end_session_keeps_lock_of_running_turn(self, service):
+        """Ending a session mid-turn neither frees its lock nor breaks a queued turn."""
+        release = asyncio.Event()
+        running = 0
+        peak = 0
+
+        async def process_message(message, context):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            if message == "slow":
+                await release.wait()
+            running -= 1
+            context.setdefault("chat_history", []).append(message)
+            return {"response": message, "session_context": context}
+
+        service.agent.process_message = process_message
+
+        slow = asyncio.create_task(service.process_message("slow", "s1"))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(service.process_message("queued", "s1"))
+        await asyncio.sleep(0)
+
+        assert service.end_session("s1")
+        assert "s1" in service._session_locks
+
+        fresh = asyncio.create_task(service.process_message("fresh", "s1"))
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(slow, queued, fresh)
+
+        assert peak == 1
+        assert all("error" not in result for result in results)
+        assert service.get_session_context("s1")["chat_history"] == ["queued", "fresh"]
@@ -0,0 +1,39 @@
+"""Tests for the database access tool."""
+
+import pytest
+
+from app.tools import database_tool
+
+
+class TestDatabaseAccessTool:
+    """Test cases for repository dispatch and catalog caching."""
+
+    @pytest.mark.asyncio
+    async def test_catalog_reads_cached_until_product_write(self, monkeypatch):
+        """Product lookups are served from cache across calls and read again after a write."""
+        calls = []
+
+        async def find_product(name):
+            calls.append(name)
+            return {"product_id": "p-1", "product_name_en": name}
+
+        async def create_product(**kwargs):
+            return None
+
+        monkeypatch.setitem(database_tool._REPOSITORY_METHODS, ("products", "find_product_by_any_name"), find_product)
+        monkeypatch.setitem(database_tool._REPOSITORY_METHODS, ("products", "create_product"), create_product)
+        tool = database_tool.DatabaseAccessTool()
+        lookup = {"table": "products", "method": "find_product_by_any_name", "args": ["Tomato"], "kwargs": {}}
+
+        first = await tool.run(lookup)
+        first["product_name_en"] = "changed"
+        second = await tool.run(lookup)
+
+        assert second == {"product_id": "p-1", "product_name_en": "Tomato"}
+        assert len(calls) == 1
+
+        await tool.run({"table": "products", "method": "create_product", "args": [], "kwargs": {"product_name_en": "Kale"}})
+        third = await tool.run(lookup)
+
+        assert third == {"product_id": "p-1", "product_name_en": "Tomato"}
+        assert len(calls) == 2
@@ -0,0 +1,181 @@
+"""Tests for the in-process tool result cache helpers."""
+
+import asyncio
+import math
+import threading
+import uuid
+from decimal import Decimal
+from enum import Enum
+
+import pytest
+
+from app.tools.cache import SingleFlight, ToolResultCache, make_cache_key
+
+
+class _Unit(str, Enum):
+    KG = "kg"
+
+
+class TestToolResultCache:
+    """Test cases for tool result caching."""
+
+    def test_cache_key_ignores_dict_ordering(self):
+        """Equivalent payloads produce the same compact integer key."""
+        first = make_cache_key({"query": "tomato", "top_k": 3})
+        second = make_cache_key({"top_k": 3, "query": "tomato"})
+
+        assert first == second
+        assert isinstance(first, int)
+        assert 0 <= first < 2**64
+        assert first != make_cache_key({"query": "tomato", "top_k": 4})
+
+    def test_cache_shares_immutable_values(self):
+        """Immutable results are shared while nested containers are copied."""
+        cache = ToolResultCache(maxsize=4)
+        frozen = ("a", 1, None)
+        cache.set(1, frozen)
+        cache.set(2, {"results": [{"text": "Store cool"}]})
+
+        assert cache.get(1) is frozen
+        cache.get(2)["results"][0]["text"] = "changed"
+        assert cache.get(2) == {"results": [{"text": "Store cool"}]}
+
+    def test_cache_falls_back_for_non_json_values(self):
+        """Payloads orjson cannot encode are still deep-copied intact."""
+        cache = ToolResultCache(maxsize=4)
+        cache.set(1, {"rows": [{"price": Decimal("25.50")}], 1: ["non-string key"]})
+
+        copied = cache.get(1)
+        copied["rows"][0]["price"] = Decimal("0")
+
+        assert cache.get(1)["rows"][0]["price"] == Decimal("25.50")
+        assert copied[1] == ["non-string key"]
+
+    def test_lru_eviction_and_isolation(self):
+        """Oldest entries are evicted and callers cannot mutate cached values."""
+        cache = ToolResultCache(maxsize=2)
+        cache.set(1, {"items": [1]})
+        cache.set(2, {"items": [2]})
+        cache.get(1)["items"].append(99)
+        cache.set(3, {"items": [3]})
+
+        assert cache.get(1) == {"items": [1]}
+        assert cache.get(2) is None
+        assert len(cache) == 2
+
+    def test_cache_snapshots_nested_and_non_json_results(self):
+        """Stored results are detached from the caller for both encoded and fallback entries."""
+        cache = ToolResultCache(maxsize=4)
+        rows = {"rows": [{"name": "Tomato"}]}
+        priced = {"rows": [{"price": Decimal("25.50")}]}
+        cache.set(1, rows)
+        cache.set(2, priced)
+        rows["rows"][0]["name"] = "changed"
+        priced["rows"][0]["price"] = Decimal("0")
+
+        assert cache.get(1) == {"rows": [{"name": "Tomato"}]}
+        assert cache.get(2) == {"rows": [{"price": Decimal("25.50")}]}
+        assert cache.get(2) is not cache.get(2)
+
+    def test_cache_keeps_types_orjson_would_change(self):
+        """UUIDs, tuples, enum members and NaN survive a cache round-trip unchanged."""
+        product_id = uuid.uuid4()
+        row = {"product_id": product_id, "unit": _Unit.KG, "range": (10, 20), "score": [math.nan]}
+        cache = ToolResultCache(maxsize=4)
+        cache.set(1, {"rows": [row]})
+
+        cached = cache.get(1)["rows"][0]
+        assert cached["product_id"] == product_id and isinstance(cached["product_id"], uuid.UUID)
+        assert cached["unit"] is _Unit.KG
+        assert cached["range"] == (10, 20)
+        assert math.isnan(cached["score"][0])
+
+    def test_ttl_expires_entries(self, monkeypatch):
+        """Entries older than the TTL are reported as misses and dropped."""
+        now = [1000.0]
+        monkeypatch.setattr("app.tools.cache.time.monotonic", lambda: now[0])
+        cache = ToolResultCache(maxsize=4, ttl=300)
+        cache.set(1, {"intent": "intent.customer.place_order"})
+
+        now[0] += 299
+        assert cache.get(1) == {"intent": "intent.customer.place_order"}
+        now[0] += 2
+        assert cache.get(1) is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_singleflight_collapses_concurrent_calls(self):
+        """Concurrent calls with the same key run the factory once."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"results": ["Store cool"]}
+
+        first, second = await asyncio.gather(flight.do(1, factory), flight.do(1, factory))
+
+        assert calls == 1
+        assert first == second
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_singleflight_waiter_survives_leader_cancellation(self):
+        """A cancelled first caller hands the work to a waiter instead of cancelling it."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"results": ["Store cool"]}
+
+        leader = asyncio.create_task(flight.do(1, factory))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do(1, factory))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == {"results": ["Store cool"]}
+        assert leader.cancelled()
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_singleflight_waiter_gets_snapshot_error(self):
+        """A result that cannot be copied fails the waiter instead of leaving it blocked."""
+        flight = SingleFlight()
+        result = {"lock": threading.Lock()}
+
+        async def factory():
+            await asyncio.sleep(0.01)
+            return result
+
+        leader = asyncio.create_task(flight.do(1, factory))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do(1, factory))
+
+        assert await leader is result
+        with pytest.raises(TypeError):
+            await asyncio.wait_for(waiter, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_singleflight_propagates_base_exceptions_to_waiters(self):
+        """A BaseException from the factory reaches every caller."""
+        flight = SingleFlight()
+
+        class _Abort(BaseException):
+            pass
+
+        async def factory():
+            await asyncio.sleep(0.01)
+            raise _Abort()
+
+        leader = asyncio.create_task(flight.do(1, factory))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do(1, factory))
+
+        results = await asyncio.wait_for(asyncio.gather(leader, waiter, return_exceptions=True), timeout=1)
+        assert all(isinstance(outcome, _Abort) for outcome in results)